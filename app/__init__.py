@@ -1,4 +1,3 @@
 from app.app import App
-from app.edge_surface import EdgeSurface
 
-__all__ = ["App", "EdgeSurface"]
+__all__ = ["App"]
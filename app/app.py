@@ -1,21 +1,44 @@
-from abc import ABC, abstractmethod
 import math
+import numpy as np
 import pygame
 
-from app.edge_surface import EdgeSurface
+from app.geometry import Transform, board_geometry
+from app.spatial import nearest_segment, segment_quads
+from app.sprites import SpriteAtlas
+from shared.enums import EdgeStatus
+from shared.slitherlink import Edge
 
+BACKGROUND = (200, 200, 200)
+# Edges are drawn in this order, so that selected ones end up on top
+EDGE_ORDER = (EdgeStatus.MARKED, EdgeStatus.EMPTY, EdgeStatus.SELECTED)
+# How wide the bar along an edge is that clicks hit it in, in pixels
+HIT_THICK = 17
+# How big the numbers may be, as a part of the width of their cells
+NUMBER_FIT = 0.7
 
-class App(ABC):
+
+class App:
     def __init__(self, game, window_size: tuple[int, int]):
         self.shape = game.shape
         self.size = game.size
         self.window_size = window_size
         self.og_window_size = window_size
         self.running = True
-        self.buttons_edges: list[EdgeSurface] = []
+        self.geometry = board_geometry(type(game.shape), game.size)
+        self.transform = Transform((1, 1), (0, 0))
+        self.edge_segments = np.empty((0, 4))
+        self.junction_points = np.empty((0, 2))
+        self.cell_points = np.empty((0, 2))
+        self.edge_styles = edge_styles(1)
+        self.edge_status = np.frombuffer(game.shape.board.edge_status, dtype=np.uint8)
+        self.drawn_view: tuple[int, int] | None = None
+        self.layer: pygame.Surface | None = None
+        self.sprites = SpriteAtlas()
+        self.lod = False
+        # Cells narrower than this many pixels are drawn without numbers
+        self.detail_pixels = 12
         self.padding = (20, 30)
         self.game = game
-        self.pressed_button = None
 
     def run(self, **kwargs):
         self.start(**kwargs)
@@ -67,31 +90,34 @@ class App(ABC):
                 print("You won!")
                 self.running = False
 
-            self.screen.fill((200, 200, 200))
-
             # TODO Fix showing solved game
-            self.draw()
+            changed = self.draw()
 
             self.clock.tick(1000)
-            self.fps_counter()
-            pygame.display.update()
+            changed.append(self.fps_counter())
+            pygame.display.update(changed)
 
     def handle_collision(self, pos):
-        real_pos = (
-            pos[0] - self.rect.left,
-            pos[1] - self.rect.top,
-        )
-        pressed = []
-        for button in self.buttons_edges:
-            if button.hitbox_button.collidepoint(real_pos):
-                if button.check_collision(real_pos):
-                    pressed.append(button)
-        if pressed:
-            button = EdgeSurface.get_closest_button(pressed, pos)
-            self.pressed_button = button
-            self.game.update(button.edge)
-            return button.edge
-        return None
+        edge = self.edge_at(pos)
+        if edge is not None:
+            self.game.update(edge)
+        return edge
+
+    def edge_at(self, pos) -> Edge | None:
+        """The edge under a point of the screen, the closest one where they
+        overlap. The point is taken back to the board through the same
+        transform the edges are drawn with, and only the edges the index
+        finds around it are measured, all at once.
+        """
+        x, y = pos[0] - self.rect.left, pos[1] - self.rect.top
+        half = HIT_THICK / 2
+        box = self.transform.unit_bounds((x - half, y - half, x + half, y + half))
+        candidates = self.geometry.edge_index.query_rect(box)
+        nearest = nearest_segment((x, y), self.edge_segments, candidates)
+        if nearest is None:
+            return None
+        index, distance = nearest
+        return self.shape.edges[index] if distance <= half else None
 
     def zoom(self, button, pos):
         mx, my = pos
@@ -108,16 +134,10 @@ class App(ABC):
 
         self.rect = pygame.Rect(left, top, width, height)
 
-        self.window_size = (
-            self.rect.size[0] - 2 * self.padding[0],
-            self.rect.size[1] - 2 * self.padding[1],
-        )
-        self.font = pygame.font.SysFont(
-            self.font_family,
-            math.ceil(self.rect.height / self.og_window_size[1] * self.font_size),
+        self.font_points = math.ceil(
+            self.rect.height / self.og_window_size[1] * self.font_size
         )
         self.do_zoom = True
-        self.setup_variables()
 
     def start(self, font="helvetica", font_size=30, stretch=False):
         pygame.init()
@@ -126,92 +146,296 @@ class App(ABC):
         )
         self.font_family = font
         self.font_size = font_size
-        self.font = pygame.font.SysFont(font, font_size)
+        self.font_points = font_size
         self.rect = self.screen.get_rect(center=self.screen.get_rect().center)
         self.stretch = stretch
         self.do_zoom = True
         self.zoom_level = 1
-        self.setup_variables()
-        self.surface = self.screen
+        self.canvas = self.screen.copy()
+        self.fps_rect = pygame.Rect(0, 0, 0, 0)
         self.clock = pygame.time.Clock()
 
     def add_padding(self, padding: tuple[float, float]) -> tuple[float, float]:
         return (padding[0] + self.padding[0], padding[1] + self.padding[1])
 
-    @abstractmethod
-    def setup_variables(self):
-        """Define useful instance variables here that are unique to the shape.
-        These can then later be used by the shape in other functions.
-
-        This function is called once, so if you need to update the value of
-        these variables, do so outside this functions
+    def keep_aspect(self) -> bool:
+        """Whether the board is scaled alike both ways, or stretched to fill
+        the window."""
+        return not self.stretch
+
+    # Drawing
+    #
+    # Where the cells, junctions and edges are is worked out once per shape
+    # and size, in unit space with grid indexes over it (app.geometry). On
+    # the first frame and after every zoom the board is laid out: a single
+    # transform takes unit space to the pixels of the board, and the points
+    # and segments are moved to pixels with it all at once. A frame then
+    # only draws what the indexes find on the screen, onto a persistent
+    # canvas the size of the screen. Panning scrolls the canvas and draws
+    # the strips that came into view, and otherwise only the areas around
+    # the edges changed by Game.update are drawn again.
+    #
+    # Edges are no surfaces but bars along their segments, drawn a status at
+    # a time with the colour of that status blended into the background.
+    #
+    # When the cells are too small to read a number in, nothing is drawn
+    # per item any more. The numbers are left out, and the dots and edges
+    # are drawn once onto a layer as big as the board, which every frame
+    # copies the visible part of.
+
+    def draw(self) -> list[pygame.Rect]:
+        """Bring the canvas and the screen up to date.
+
+        :return: the areas of the screen that changed
         """
-        return NotImplemented
-
-    def draw(self):
-        sr = self.screen.get_rect()
-        r = self.rect
-
-        if r.left > sr.width or r.top > sr.height or r.right < 0 or r.bottom < 0:
-            return
-
-        self.surface = self.screen.copy()
-        self.draw_cells()
-        self.draw_junctions()
-        self.draw_edges()
+        if self.do_zoom:
+            self.layout()
+        dirty = self.update_touched()
+        moved = self.move_view()
+        changed = [r for r in map(self.redraw_area, dirty) if r]
+        return [self.screen.get_rect()] if moved else changed
+
+    def layout(self):
+        """Lay the board out for the current zoom."""
+        geometry = self.geometry
+        pad_x, pad_y = self.padding
+        area = (pad_x, pad_y, self.rect.width - pad_x, self.rect.height - pad_y)
+        self.transform = Transform.fit(geometry.bounds, area, self.keep_aspect())
+        self.edge_segments = self.transform.segments(geometry.edges)
+        self.junction_points = self.transform.points(geometry.junctions)
+        self.cell_points = self.transform.points(geometry.cells)
+        self.edge_styles = edge_styles(self.ratio)
+
+        self.lod = self.cell_pixels() < self.detail_pixels
+        self.sprites.set_zoom(self.zoom_level)
+
+        # Numbers shrink to fit their cells rather than cover the cells
+        # around them, on boards with more cells than the window fits
+        fit = max(int(self.cell_pixels() * NUMBER_FIT), 1)
+        self.number_points = min(self.font_points, fit)
+
+        self.layer = None
+        if self.lod:
+            self.layer = pygame.Surface(self.rect.size).convert()
+            self.layer.fill(BACKGROUND)
+            self.paint(self.layer, self.layer.get_rect(), (0, 0))
         self.do_zoom = False
+        self.drawn_view = None
 
-        self.screen.blit(
-            self.surface,
-            (max(r.left, 0), max(r.top, 0)),
-        )
+    def move_view(self) -> bool:
+        """Follow the view to where the board is now.
 
-    def fps_counter(self):
-        fps = str(int(self.clock.get_fps()))
-        fps_t = self.font.render(fps, True, pygame.Color("RED"))
-        self.screen.blit(fps_t, (0, 0))
-
-    def render(self, source, rect):
-        left, top = rect.topleft
-
-        if self.rect.left < 0:
-            left += self.rect.left
-
-        if self.rect.top < 0:
-            top += self.rect.top
-
-        self.surface.blit(source, (left, top))
-
-    def draw_point(self, x, y, width=1):
-        width = self.ratio + width
-        s = pygame.Surface((2 * width, 2 * width))
-        s.set_colorkey((0, 0, 0))
-        s.set_alpha(255)
-        pygame.draw.circle(
-            s,
-            (1, 1, 1, 255),
-            (width, width),
-            width,
-        )
-        rect = pygame.Rect(
-            x + self.padding[0] - width, y + self.padding[1] - width, width, width
+        :return: whether it moved
+        """
+        if self.rect.topleft == self.drawn_view:
+            return False
+        width, height = self.canvas.get_size()
+        if self.drawn_view is None:
+            dx, dy = width, height
+        else:
+            dx = self.rect.left - self.drawn_view[0]
+            dy = self.rect.top - self.drawn_view[1]
+        self.drawn_view = self.rect.topleft
+
+        if abs(dx) >= width or abs(dy) >= height:
+            self.draw_screen_area(self.canvas.get_rect())
+        else:
+            # pygame also draws the parts of polygons left of a surface onto
+            # its first column, so what scrolls onto or off that column is
+            # drawn again too
+            self.canvas.scroll(dx, dy)
+            if dx > 0:
+                self.draw_screen_area(pygame.Rect(0, 0, dx + 1, height))
+            elif dx < 0:
+                self.draw_screen_area(pygame.Rect(width + dx, 0, -dx, height))
+                self.draw_screen_area(pygame.Rect(0, 0, 1, height))
+            if dy:
+                top = 0 if dy > 0 else height + dy
+                self.draw_screen_area(pygame.Rect(0, top, width, abs(dy)))
+        self.screen.blit(self.canvas, (0, 0))
+        return True
+
+    def draw_screen_area(self, target: pygame.Rect):
+        """Draw an area of the canvas again, from the board under it."""
+        self.canvas.set_clip(target)
+        self.canvas.fill(BACKGROUND, target)
+        self.draw_area(target.move(-self.rect.left, -self.rect.top))
+        self.canvas.set_clip(None)
+
+    def draw_area(self, area: pygame.Rect):
+        """Draw an area of the board onto the canvas, which has to be clear."""
+        if self.layer is not None:
+            self.canvas.blit(self.layer, area.move(self.rect.topleft), area)
+        else:
+            self.paint(self.canvas, area, self.rect.topleft)
+
+    def paint(self, surface: pygame.Surface, area: pygame.Rect, offset):
+        """Draw the numbers, then the dots and then the edges that overlap an
+        area of the board onto a surface.
+
+        :param offset: where the board is on the surface
+        """
+        # Whatever is found around the area, as far as a number, dot or bar
+        # can reach out of the box it is indexed by
+        dot = self.dot()
+        reach = max(self.number_points, dot.get_width(), self.edge_styles[-1][2]) + 1
+        near = area.inflate(2 * reach, 2 * reach)
+        box = self.transform.unit_bounds((near.left, near.top, near.right, near.bottom))
+        geometry = self.geometry
+        # Everything is placed on whole pixels of the board, so that it has
+        # the same pixels wherever the board is on the surface
+        x, y = offset
+
+        if not self.lod:
+            cells = geometry.cell_index.query_rect(box)
+            constraints = np.frombuffer(self.shape.board.constraints, dtype=np.int8)
+            cells = cells[constraints[cells] >= 0]
+            draws = []
+            for c, (cx, cy) in zip(
+                constraints[cells].tolist(), self.cell_points[cells].tolist()
+            ):
+                text = self.text(str(c))
+                w, h = text.get_size()
+                draws.append((text, (round(cx - w / 2) + x, round(cy - h / 2) + y)))
+            surface.blits(draws, doreturn=False)
+
+        junctions = geometry.junction_index.query_rect(box)
+        radius = dot.get_width() // 2
+        corners = np.rint(self.junction_points[junctions] - radius).astype(int)
+        surface.blits(
+            [(dot, (left + x, top + y)) for left, top in corners.tolist()],
+            doreturn=False,
         )
 
-        self.render(s, rect)
-        return (s, rect)
-
-    @abstractmethod
-    def draw_cells(self):
-        return NotImplemented
-
-    @abstractmethod
-    def draw_junctions(self):
-        return NotImplemented
+        edges = geometry.edge_index.query_rect(box)
+        paint_edges(
+            surface,
+            self.edge_segments[edges],
+            self.edge_status[edges],
+            self.edge_styles,
+            offset,
+        )
 
-    @abstractmethod
-    def draw_edges(self):
-        return NotImplemented
+    def update_touched(self) -> list[pygame.Rect]:
+        """The areas of the board around the edges changed since the last
+        frame, which have to be drawn again, whatever status they had."""
+        touched = sorted(self.game.take_touched())
+        if not touched:
+            return []
+        reach = self.edge_styles[-1][2] / 2 + 1
+        segments = self.edge_segments[touched]
+        # Whole pixels, taking in every pixel a rounded corner can land on
+        low = np.floor(np.minimum(segments[:, :2], segments[:, 2:]) - reach)
+        high = np.ceil(np.maximum(segments[:, :2], segments[:, 2:]) + reach)
+        return [
+            pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+            for left, top, right, bottom in np.hstack([low, high]).tolist()
+        ]
+
+    def redraw_area(self, area: pygame.Rect) -> pygame.Rect | None:
+        """Draw an area of the board again.
+
+        :return: the area of the screen that changed, None when it is not
+            on the screen
+        """
+        if self.layer is not None:
+            self.layer.set_clip(area)
+            self.layer.fill(BACKGROUND, area)
+            self.paint(self.layer, area, (0, 0))
+            self.layer.set_clip(None)
+
+        target = area.move(self.rect.topleft).clip(self.canvas.get_rect())
+        if not target:
+            return None
+        self.draw_screen_area(target)
+        self.screen.blit(self.canvas, target, target)
+        return target
+
+    def fps_counter(self) -> pygame.Rect:
+        """Draw the frame rate in the top left corner a digit at a time, so
+        that the sprite atlas holds at most ten glyphs for it.
+
+        :return: the area of the screen that changed
+        """
+        fps = str(int(self.clock.get_fps()))
+        draws = []
+        x = 0
+        for digit in fps:
+            glyph = self.sprites.glyph(
+                digit, self.font_family, self.font_points, (255, 0, 0)
+            )
+            draws.append((glyph, (x, 0)))
+            x += glyph.get_width()
+        self.screen.blit(self.canvas, self.fps_rect, self.fps_rect)
+        changed = self.fps_rect
+        self.fps_rect = pygame.Rect(0, 0, x, draws[0][0].get_height())
+        self.screen.blits(draws, doreturn=False)
+        return changed.union(self.fps_rect)
+
+    def text(self, value: str) -> pygame.Surface:
+        """A number for a cell, from the sprite atlas."""
+        return self.sprites.glyph(value, self.font_family, self.number_points)
+
+    def dot(self) -> pygame.Surface:
+        """The dot drawn on every junction, from the sprite atlas."""
+        return self.sprites.dot(self.ratio + 1)
+
+    def cell_pixels(self) -> float:
+        """How wide the cells are on the screen, in pixels, where they are
+        narrowest. A cell is one unit wide in the geometry."""
+        return min(self.transform.scale)
 
-    @abstractmethod
     def draw_solution(self):
-        return NotImplemented
+        """Select every edge of the solution."""
+        for edge in self.shape.edges:
+            if edge.should_be_selected():
+                while not edge.is_selected():
+                    self.game.update(edge)
+
+
+def edge_style(status: EdgeStatus, ratio: float) -> tuple[tuple[int, ...], int]:
+    """The colour, with alpha, and the thickness of an edge."""
+    match status:
+        case EdgeStatus.MARKED:
+            return (0, 0, 0, 15), max(int(ratio), 1)
+        case EdgeStatus.EMPTY:
+            return (0, 0, 0, 160), max(int(ratio), 1)
+        case EdgeStatus.SELECTED:
+            return (0, 0, 0, 255), int(2 + 2 * ratio)
+
+
+def paint_edges(
+    surface: pygame.Surface,
+    segments: np.ndarray,
+    status: np.ndarray,
+    styles: list[tuple[int, tuple[int, int, int], int]],
+    offset: tuple[int, int] = (0, 0),
+):
+    """Draw edges as bars, a status at a time in the order of the styles.
+
+    Corners are rounded before the offset is added, so that a bar has the
+    same pixels wherever it is on the surface.
+
+    :param segments: an array of shape (n, 4) of (x0, y0, x1, y1)
+    :param status: the status value of every edge
+    :param styles: from :func:`edge_styles`
+    """
+    polygon = pygame.draw.polygon
+    for value, color, thick in styles:
+        quads = np.rint(segment_quads(segments[status == value], thick))
+        for quad in (quads + offset).astype(int).tolist():
+            polygon(surface, color, quad)
+
+
+def edge_styles(ratio: float) -> list[tuple[int, tuple[int, int, int], int]]:
+    """The status value, opaque colour and thickness edges are drawn with,
+    in the order they are drawn in."""
+    styles = []
+    for status in EDGE_ORDER:
+        (*rgb, alpha), thick = edge_style(status, ratio)
+        color = tuple(
+            round(c * alpha / 255 + b * (255 - alpha) / 255)
+            for c, b in zip(rgb, BACKGROUND)
+        )
+        styles.append((status.value, color, thick))
+    return styles
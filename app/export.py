@@ -0,0 +1,166 @@
+"""Draws puzzles as SVG and PNG, without a window.
+
+A picture is made from a :class:`PuzzleRecord` alone, the clues and the
+loop as they are stored, through the same geometry, colours and
+thicknesses as the app. SVG is written as text. PNG is drawn by pygame
+onto a plain surface and saved, with SDL's dummy video driver, so neither
+ever opens a window, and both run in worker processes as they are.
+
+    page = Page(cell=40, solution=True)
+    svg = render_svg(record, page)
+    save_png(render_png(record, page), "puzzle.png")
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import os
+from xml.sax.saxutils import escape
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from app.app import BACKGROUND, NUMBER_FIT, edge_styles, paint_edges  # noqa: E402
+from app.geometry import Geometry, Transform, board_geometry  # noqa: E402
+from app.sprites import SpriteAtlas  # noqa: E402
+from generator.puzzle_file import PuzzleRecord  # noqa: E402
+from generator.stream import SHAPES  # noqa: E402
+from shared.enums import EdgeStatus  # noqa: E402
+
+FORMATS = ("svg", "png")
+
+# Glyphs and dots are kept between the puzzles a process draws
+_sprites = SpriteAtlas()
+
+
+@dataclass(frozen=True)
+class Page:
+    """How puzzles are drawn.
+
+    :param cell: the width of a cell, in pixels
+    :param margin: the space around the board, in pixels
+    :param ratio: how thick edges and dots are, as the zoom ratio of the app
+    :param font: the font family of the numbers
+    :param solution: draw the loop, rather than the bare puzzle
+    """
+
+    cell: int = 32
+    margin: int = 16
+    ratio: int = 1
+    font: str = "helvetica"
+    solution: bool = False
+
+    @property
+    def number_points(self) -> int:
+        return max(int(self.cell * NUMBER_FIT), 1)
+
+    @property
+    def dot_radius(self) -> int:
+        return self.ratio + 1
+
+
+def place(record: PuzzleRecord, page: Page) -> tuple[Geometry, Transform, tuple]:
+    """Lay the board of a puzzle out on a page.
+
+    :return: the geometry of the board, the transform to pixels and the
+        size of the picture
+    """
+    geometry = board_geometry(SHAPES[record.shape], record.size)
+    left, top, right, bottom = geometry.bounds
+    width = round((right - left) * page.cell) + 2 * page.margin
+    height = round((bottom - top) * page.cell) + 2 * page.margin
+    area = (page.margin, page.margin, width - page.margin, height - page.margin)
+    return geometry, Transform.fit(geometry.bounds, area), (width, height)
+
+
+def edge_status(record: PuzzleRecord, page: Page) -> np.ndarray:
+    """The status every edge is drawn with: the loop selected on a
+    solution, and every edge empty otherwise."""
+    status = np.full(len(record.solution), EdgeStatus.EMPTY.value, dtype=np.uint8)
+    if page.solution:
+        status[record.solution] = EdgeStatus.SELECTED.value
+    return status
+
+
+def render_svg(record: PuzzleRecord, page: Page = Page()) -> str:
+    """Draw a puzzle as an SVG document, in the order the app draws it:
+    the numbers, the dots and then the edges."""
+    geometry, transform, (width, height) = place(record, page)
+    cells = transform.points(geometry.cells)
+    junctions = transform.points(geometry.junctions)
+    segments = transform.segments(geometry.edges)
+    status = edge_status(record, page)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}"'
+        f' height="{height}" viewBox="0 0 {width} {height}">',
+        f'<rect width="100%" height="100%" fill="{svg_color(BACKGROUND)}"/>',
+        f'<g font-family="{escape(page.font)}" font-size="{page.number_points}"'
+        ' text-anchor="middle" dominant-baseline="central">',
+    ]
+    numbered = np.flatnonzero(record.clues >= 0)
+    parts += [
+        f'<text x="{x:.1f}" y="{y:.1f}">{c}</text>'
+        for c, (x, y) in zip(record.clues[numbered].tolist(), cells[numbered].tolist())
+    ]
+    parts.append('</g><g fill="#000" stroke="none">')
+    parts += [
+        f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{page.dot_radius}"/>'
+        for x, y in junctions.tolist()
+    ]
+    parts.append("</g>")
+    for value, color, thick in edge_styles(page.ratio):
+        chosen = segments[status == value].tolist()
+        if not chosen:
+            continue
+        path = "".join(f"M{a:.1f} {b:.1f}L{c:.1f} {d:.1f}" for a, b, c, d in chosen)
+        parts.append(
+            f'<path d="{path}" fill="none" stroke="{svg_color(color)}"'
+            f' stroke-width="{thick}"/>'
+        )
+    parts.append("</svg>\n")
+    return "\n".join(parts)
+
+
+def render_png(record: PuzzleRecord, page: Page = Page()) -> pygame.Surface:
+    """Draw a puzzle onto a new surface, as the app draws it."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    geometry, transform, size = place(record, page)
+    surface = pygame.Surface(size)
+    surface.fill(BACKGROUND)
+    _sprites.set_zoom(page.cell)
+
+    numbered = np.flatnonzero(record.clues >= 0)
+    draws = []
+    for c, (x, y) in zip(
+        record.clues[numbered].tolist(),
+        transform.points(geometry.cells[numbered]).tolist(),
+    ):
+        text = _sprites.glyph(str(c), page.font, page.number_points)
+        w, h = text.get_size()
+        draws.append((text, (round(x - w / 2), round(y - h / 2))))
+    surface.blits(draws, doreturn=False)
+
+    dot = _sprites.dot(page.dot_radius)
+    corners = np.rint(transform.points(geometry.junctions) - page.dot_radius)
+    surface.blits(
+        [(dot, corner) for corner in corners.astype(int).tolist()], doreturn=False
+    )
+
+    paint_edges(
+        surface,
+        transform.segments(geometry.edges),
+        edge_status(record, page),
+        edge_styles(page.ratio),
+    )
+    return surface
+
+
+def save_png(surface: pygame.Surface, path: str) -> None:
+    pygame.image.save(surface, path)
+
+
+def svg_color(color: tuple[int, int, int]) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*color)
@@ -0,0 +1,166 @@
+"""Where the cells, junctions and edges of a board are.
+
+A board is laid out once per shape and size, in unit space where a cell is
+one unit wide, and kept as NumPy arrays with grid indexes over them. How a
+board looks at some zoom and pan is then a :class:`Transform` from unit
+space to pixels, the same one for drawing and for finding what was clicked.
+Nothing here needs pygame, so boards can be drawn without a window too.
+
+    geometry = board_geometry(Hexagon, 40)
+    transform = Transform.fit(geometry.bounds, (20, 30, 620, 630))
+    segments = transform.segments(geometry.edges)
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+import math
+import numpy as np
+
+from app.spatial import GridIndex
+from generator.generator import Generator
+from shared.board import Topology
+
+Bounds = tuple[float, float, float, float]
+
+
+@dataclass(frozen=True, eq=False)
+class Geometry:
+    """A board laid out in unit space, shared by every view of it, so its
+    arrays must not be changed.
+
+    ``edges`` holds the segment (x0, y0, x1, y1) of every edge, ``cells``
+    the centre of every cell and ``junctions`` the point of every junction,
+    each by the id of the edge, cell or junction.
+    """
+
+    junctions: np.ndarray
+    edges: np.ndarray
+    cells: np.ndarray
+    bounds: Bounds
+    junction_index: GridIndex
+    edge_index: GridIndex
+    cell_index: GridIndex
+
+    @classmethod
+    def build(cls, topology: Topology, junctions: np.ndarray) -> Geometry:
+        """Lay a board out from where its junctions are.
+
+        :param junctions: an array of shape (num_junctions, 2)
+        """
+        offsets, ends = topology.edge_junctions.numpy()
+        if not (np.diff(offsets) == 2).all():
+            raise ValueError("every edge must have two junctions")
+        edges = junctions[ends].reshape(-1, 4)
+
+        # A cell is the polygon of its junctions, which all lie on the box
+        # around it, so the middle of that box is the middle of the cell
+        offsets, corners = topology.cell_junctions.numpy()
+        points = junctions[corners]
+        low = np.minimum.reduceat(points, offsets[:-1])
+        high = np.maximum.reduceat(points, offsets[:-1])
+        cells = (low + high) / 2
+
+        left, top = junctions.min(axis=0)
+        right, bottom = junctions.max(axis=0)
+        return cls(
+            junctions,
+            edges,
+            cells,
+            (float(left), float(top), float(right), float(bottom)),
+            GridIndex(np.hstack([junctions, junctions])),
+            GridIndex(segment_bounds(edges)),
+            GridIndex(np.hstack([low, high])),
+        )
+
+
+def segment_bounds(segments: np.ndarray) -> np.ndarray:
+    """The boxes (left, top, right, bottom) around segments."""
+    return np.hstack(
+        [
+            np.minimum(segments[:, :2], segments[:, 2:]),
+            np.maximum(segments[:, :2], segments[:, 2:]),
+        ]
+    )
+
+
+def rectangle_junctions(size: tuple[int, int]) -> np.ndarray:
+    """The junctions of a rectangle, row by row, one unit apart."""
+    w, h = size
+    x, y = np.meshgrid(np.arange(w + 1), np.arange(h + 1))
+    return np.stack([x.ravel(), y.ravel()], axis=1).astype(float)
+
+
+def hexagon_junctions(size: int) -> np.ndarray:
+    """The junctions of a hexagon of hexagons with their points up, in the
+    order of :func:`generator.shapes.hexagon.get_junctions`.
+
+    The rows of cells are centred on x = 0 and the middle row on y = 0. The
+    junctions come in rows of two: the top points of a row of cells and the
+    corners below them. The lower half of the board is the upper half
+    turned around the centre.
+    """
+    edge = 1 / math.sqrt(3)
+    points = []
+    for row in range(size):
+        cells = size + row
+        y = (row - size + 1) * 1.5 * edge
+        points += [(i - (cells - 1) / 2, y - edge) for i in range(cells)]
+        points += [(i - cells / 2, y - edge / 2) for i in range(cells + 1)]
+    upper = np.array(points)
+    return np.vstack([upper, -upper[::-1]])
+
+
+JUNCTIONS = {"square": rectangle_junctions, "hexagon": hexagon_junctions}
+
+
+@lru_cache(maxsize=16)
+def board_geometry(shape: type[Generator], size: int | tuple[int, int]) -> Geometry:
+    """Lay out a shape at a size, keeping the most recently used ones."""
+    return Geometry.build(shape.topology(size), JUNCTIONS[shape.shape](size))
+
+
+@dataclass(frozen=True)
+class Transform:
+    """Scales unit space and moves it to pixels: ``p * scale + offset``."""
+
+    scale: tuple[float, float]
+    offset: tuple[float, float]
+
+    @classmethod
+    def fit(cls, bounds: Bounds, area: Bounds, keep_aspect: bool = True) -> Transform:
+        """Fit bounds in unit space into an area of pixels, in the middle.
+
+        :param keep_aspect: scale both ways alike, or else fill the area
+        """
+        left, top, right, bottom = bounds
+        sx = (area[2] - area[0]) / max(right - left, 1e-9)
+        sy = (area[3] - area[1]) / max(bottom - top, 1e-9)
+        if keep_aspect:
+            sx = sy = min(sx, sy)
+        return cls(
+            (sx, sy),
+            (
+                (area[0] + area[2] - (left + right) * sx) / 2,
+                (area[1] + area[3] - (top + bottom) * sy) / 2,
+            ),
+        )
+
+    def points(self, points: np.ndarray) -> np.ndarray:
+        """Move an array of shape (n, 2) of points to pixels."""
+        return points * self.scale + self.offset
+
+    def segments(self, segments: np.ndarray) -> np.ndarray:
+        """Move an array of shape (n, 4) of segments or boxes to pixels."""
+        return segments * (self.scale * 2) + (self.offset * 2)
+
+    def unit_point(self, point: tuple[float, float]) -> tuple[float, float]:
+        """Where a pixel is in unit space."""
+        (sx, sy), (ox, oy) = self.scale, self.offset
+        return ((point[0] - ox) / sx, (point[1] - oy) / sy)
+
+    def unit_bounds(self, bounds: Bounds) -> Bounds:
+        """The box in unit space that a box of pixels covers."""
+        left, top = self.unit_point(bounds[:2])
+        right, bottom = self.unit_point(bounds[2:])
+        return (left, top, right, bottom)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Sequence
+import math
+import numpy as np
+
+
+class GridIndex:
+    """Buckets items by the squares of a uniform grid that their boxes
+    overlap, so the items near a point are found by looking at a single
+    bucket instead of at every item.
+
+    The grid squares are about the size of an item, so an item lands in a
+    handful of buckets and a bucket holds a handful of items. The items are
+    the rows of an array of boxes, and the buckets are kept the way an
+    :class:`shared.board.Incidence` keeps its rows: the items of every grid
+    square one after the other, column by column, with the offset of every
+    square into them. The squares of a column are next to each other, so
+    the items in a box are a slice per column.
+    """
+
+    __slots__ = ("size", "cell_size", "origin", "width", "height", "offsets", "items")
+
+    size: int
+    cell_size: float
+    origin: tuple[int, int]
+    width: int
+    height: int
+    offsets: np.ndarray
+    items: np.ndarray
+
+    def __init__(self, bounds: np.ndarray, cell_size: float | None = None):
+        """
+        :param bounds: an array of shape (n, 4) of (left, top, right, bottom)
+        :param cell_size: the side of a grid square, by default the average
+            size of a box
+        """
+        bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+        self.size = len(bounds)
+        if cell_size is None:
+            sizes = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+            cell_size = float(sizes.mean()) if len(sizes) else 1
+        self.cell_size = cell_size if cell_size > 0 else 1
+
+        squares = np.floor(bounds / self.cell_size).astype(np.int64)
+        if len(squares):
+            left, top = squares[:, 0].min(), squares[:, 1].min()
+            self.origin = (int(left), int(top))
+            self.width = int(squares[:, 2].max() - left) + 1
+            self.height = int(squares[:, 3].max() - top) + 1
+        else:
+            self.origin, self.width, self.height = (0, 0), 0, 0
+        squares -= self.origin * 2
+
+        # One entry for every square of every box
+        columns = squares[:, 2] - squares[:, 0] + 1
+        rows = squares[:, 3] - squares[:, 1] + 1
+        counts = columns * rows
+        items = np.repeat(np.arange(len(bounds)), counts)
+        k = np.arange(len(items)) - np.repeat(np.cumsum(counts) - counts, counts)
+        gx = squares[items, 0] + k // rows[items]
+        gy = squares[items, 1] + k % rows[items]
+
+        keys = gx * self.height + gy
+        self.items = items[np.argsort(keys, kind="stable")]
+        self.offsets = np.zeros(self.width * self.height + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(keys, minlength=self.width * self.height), out=self.offsets[1:]
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def query(self, point: tuple[float, float]) -> np.ndarray:
+        """The items whose boxes may hold a point. Every item whose box
+        holds it is among them, but so may be a few whose box does not."""
+        gx = math.floor(point[0] / self.cell_size) - self.origin[0]
+        gy = math.floor(point[1] / self.cell_size) - self.origin[1]
+        if not (0 <= gx < self.width and 0 <= gy < self.height):
+            return self.items[:0]
+        key = gx * self.height + gy
+        return self.items[self.offsets[key] : self.offsets[key + 1]]
+
+    def query_rect(self, bounds) -> np.ndarray:
+        """The items whose boxes may overlap a box, each once and sorted.
+
+        :param bounds: (left, top, right, bottom)
+        """
+        size, (ox, oy) = self.cell_size, self.origin
+        left = max(math.floor(bounds[0] / size) - ox, 0)
+        top = max(math.floor(bounds[1] / size) - oy, 0)
+        right = min(math.floor(bounds[2] / size) - ox, self.width - 1)
+        bottom = min(math.floor(bounds[3] / size) - oy, self.height - 1)
+        if right < left or bottom < top:
+            return self.items[:0]
+
+        columns = np.arange(left, right + 1) * self.height
+        starts = self.offsets[columns + top]
+        ends = self.offsets[columns + bottom + 1]
+        if left == right and top == bottom:
+            return self.items[starts[0] : ends[0]]
+        counts = ends - starts
+        entries = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        entries += np.arange(len(entries))
+        items = np.sort(self.items[entries])
+        first = np.ones(len(items), dtype=bool)
+        np.not_equal(items[1:], items[:-1], out=first[1:])
+        return items[first]
+
+
+def segment_distances(point: tuple[float, float], segments: np.ndarray) -> np.ndarray:
+    """How far a point is from each of a number of segments.
+
+    :param segments: an array of shape (n, 4) of (x0, y0, x1, y1)
+    """
+    start, end = segments[:, :2], segments[:, 2:]
+    along = end - start
+    lengths = np.einsum("ij,ij->i", along, along)
+    offset = np.asarray(point, dtype=float) - start
+    t = np.einsum("ij,ij->i", offset, along) / np.where(lengths > 0, lengths, 1)
+    t = np.clip(t, 0, 1)
+    return np.hypot(*(offset - t[:, None] * along).T)
+
+
+def nearest_segment(
+    point: tuple[float, float], segments: np.ndarray, candidates: Sequence[int]
+) -> tuple[int, float] | None:
+    """The closest of some candidate segments to a point.
+
+    :return: (index of the segment, distance), or None without candidates
+    """
+    if len(candidates) == 0:
+        return None
+    distances = segment_distances(point, segments[candidates])
+    k = int(distances.argmin())
+    return candidates[k], float(distances[k])
+
+
+def segment_quads(segments: np.ndarray, width: float) -> np.ndarray:
+    """The corners of the bars a number of segments are drawn as.
+
+    Bars are drawn as polygons rather than thick lines, since pygame draws
+    a polygon with the same pixels however it is clipped, which a thick line
+    it does not.
+
+    :param segments: an array of shape (n, 4) of (x0, y0, x1, y1)
+    :return: an array of shape (n, 4, 2)
+    """
+    start, end = segments[:, :2], segments[:, 2:]
+    along = end - start
+    lengths = np.hypot(*along.T)
+    normal = along[:, ::-1] * (-1, 1) / np.where(lengths > 0, lengths, 1)[:, None]
+    side = normal * (width / 2)
+    return np.stack([start + side, end + side, end - side, start - side], axis=1)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import pygame
+
+from shared import instrument
+
+
+class SpriteAtlas:
+    """Surfaces that are drawn many times over, made once per zoom level.
+
+    A board shows the same few clue numbers in every cell and the same dot
+    on every junction, so the app takes them from here instead of rendering
+    text and drawing a circle for each of them. Glyphs are keyed by their
+    text, font size and colour, dots by their radius, and both by the zoom
+    level. Moving to another zoom level drops every sprite, since none of
+    them is the right size any more.
+
+    Making a sprite counts as ``sprites.glyph`` or ``sprites.dot`` in
+    :mod:`shared.instrument`.
+    """
+
+    __slots__ = ("zoom", "sprites", "fonts")
+
+    zoom: float | None
+    sprites: dict[tuple, pygame.Surface]
+    fonts: dict[tuple[str, int], pygame.font.Font]
+
+    def __init__(self):
+        self.zoom = None
+        self.sprites = {}
+        self.fonts = {}
+
+    def __len__(self) -> int:
+        return len(self.sprites)
+
+    def set_zoom(self, zoom: float) -> None:
+        """Move to a zoom level, dropping every sprite if it is another one."""
+        if zoom != self.zoom:
+            self.sprites.clear()
+            self.zoom = zoom
+
+    def font(self, family: str, points: int) -> pygame.font.Font:
+        key = (family, points)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(family, points)
+        return font
+
+    def glyph(
+        self,
+        text: str,
+        family: str,
+        points: int,
+        color: tuple[int, int, int] = (0, 0, 0),
+    ) -> pygame.Surface:
+        """Text rendered in a font, as the cell numbers are."""
+        key = ("glyph", text, points, self.zoom, family, color)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.font(family, points).render(text, True, color)
+            self.sprites[key] = sprite
+            instrument.count("sprites.glyph")
+        return sprite
+
+    def dot(self, radius: int) -> pygame.Surface:
+        """A junction dot, a filled circle on a transparent square."""
+        key = ("dot", radius, self.zoom)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((2 * radius, 2 * radius))
+            sprite.set_colorkey((0, 0, 0))
+            sprite.set_alpha(255)
+            pygame.draw.circle(sprite, (1, 1, 1, 255), (radius, radius), radius)
+            self.sprites[key] = sprite
+            instrument.count("sprites.dot")
+        return sprite
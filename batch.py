@@ -0,0 +1,168 @@
+"""Generates puzzles in bulk across a pool of processes.
+
+Every puzzle gets its own seed, drawn from one base seed, so a whole batch
+can be reproduced and every puzzle can be rebuilt from its puzzle ID alone.
+Finished puzzles are written as JSON lines as soon as they complete, or
+into a binary puzzle file that can be memory-mapped.
+
+    python batch.py hexagon 20 --count 1000 --output pack.jsonl
+    python batch.py square 10x10 --count 500 --workers 4 --seed 7
+    python batch.py square 20x20 --count 100 --minimise
+    python batch.py square 20x20 --count 100000 --binary --output pack.slk
+"""
+
+from __future__ import annotations
+import argparse
+import json
+from itertools import islice
+import multiprocessing
+import sys
+import time
+from typing import IO, Iterator
+
+from game import Game
+from generator.puzzle_file import PuzzleWriter
+from generator.stream import SHAPES, seed_stream
+
+
+def generate_puzzle(
+    job: tuple[str, int | tuple[int, int], int, bool, bool],
+) -> dict | bytes:
+    """Generate one puzzle and its numbers without any output.
+
+    :param job: (shape, size, seed, whether to minimise the clues, whether
+        to encode the puzzle for a puzzle file)
+    :return: the puzzle as a JSON-serializable record, where a removed clue
+        is null, or as an encoded :class:`PuzzleRecord`
+    """
+    shape, size, seed, minimised, binary = job
+    gen = SHAPES[shape].generate(size, seed)
+    game = Game(gen, size).start()
+    gen.gen_loop()
+    game.populate_numbers()
+    if minimised:
+        game.minimise_numbers()
+    if binary:
+        return game.record().encode()
+    return {
+        "id": gen.puzzle_id,
+        "shape": shape,
+        "size": size,
+        "seed": seed,
+        "clues": [cell.constraint for cell in gen.cells],
+        "solution": [edge.ident for edge in gen.edges if edge.should_be_selected()],
+    }
+
+
+def job_seeds(count: int, seed: int | None = None) -> list[int]:
+    """Draw independent 64-bit seeds for every puzzle of a batch."""
+    return list(islice(seed_stream(seed), count))
+
+
+def generate_batch(
+    shape: str,
+    size: int | tuple[int, int],
+    count: int,
+    workers: int | None = None,
+    seed: int | None = None,
+    minimised: bool = False,
+    binary: bool = False,
+) -> Iterator[dict | bytes]:
+    """Generate puzzles on a process pool, yielding them as they finish.
+
+    :param shape: "square" or "hexagon"
+    :param size: (width, height) of a rectangle or the side of a hexagon
+    :param count: how many puzzles to generate
+    :param workers: the number of processes, defaults to the number of CPUs
+    :param seed: the base seed of the batch, a fresh one when left out
+    :param minimised: remove clues while every puzzle stays unique
+    :param binary: yield encoded puzzle records instead of dicts
+    :return: the puzzle records, in the order they complete
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape {shape!r}")
+    jobs = [(shape, size, s, minimised, binary) for s in job_seeds(count, seed)]
+    if workers == 1:
+        yield from map(generate_puzzle, jobs)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(generate_puzzle, jobs)
+
+
+def write_batch(records: Iterator[dict], output: IO[str]) -> tuple[int, float]:
+    """Stream puzzle records to a file, one JSON object per line.
+
+    :return: (number of puzzles written, seconds taken)
+    """
+    start = time.perf_counter()
+    written = 0
+    for record in records:
+        output.write(json.dumps(record, separators=(",", ":")) + "\n")
+        output.flush()
+        written += 1
+    return written, time.perf_counter() - start
+
+
+def write_binary(records: Iterator[bytes], path: str) -> tuple[int, float]:
+    """Stream encoded puzzle records into a puzzle file.
+
+    :return: (number of puzzles written, seconds taken)
+    """
+    start = time.perf_counter()
+    with PuzzleWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    return len(writer), time.perf_counter() - start
+
+
+def parse_size(shape: str, size: str) -> int | tuple[int, int]:
+    if shape == "square":
+        w, _, h = size.partition("x")
+        return (int(w), int(h or w))
+    return int(size)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Generate slitherlink puzzles.")
+    parser.add_argument("shape", choices=sorted(SHAPES))
+    parser.add_argument("size", help="WxH for squares, the side for hexagons")
+    parser.add_argument("-n", "--count", type=int, default=100)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", default="-", help="file, - for stdout")
+    parser.add_argument(
+        "-m", "--minimise", action="store_true", help="remove redundant clues"
+    )
+    parser.add_argument(
+        "-b", "--binary", action="store_true", help="write a binary puzzle file"
+    )
+    args = parser.parse_args(argv)
+    if args.binary and args.output == "-":
+        parser.error("--binary needs an --output file")
+
+    records = generate_batch(
+        args.shape,
+        parse_size(args.shape, args.size),
+        args.count,
+        args.workers,
+        args.seed,
+        args.minimise,
+        args.binary,
+    )
+    if args.binary:
+        written, seconds = write_binary(records, args.output)
+    elif args.output == "-":
+        written, seconds = write_batch(records, sys.stdout)
+    else:
+        with open(args.output, "w") as output:
+            written, seconds = write_batch(records, output)
+
+    rate = written / seconds if seconds > 0 else float("inf")
+    print(
+        f"Generated {written} puzzles in {round(seconds, 3)}s ({rate:.1f} puzzles/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Benchmarks of the generator, the solver and the app.
+
+Every module is a script that prints what it measures. Run one from the
+repository root with ``python -m benchmarks.<module>``, e.g.
+``python -m benchmarks.suite``.
+"""
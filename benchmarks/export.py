@@ -0,0 +1,65 @@
+"""Times drawing puzzles as pictures, without writing them.
+
+A few puzzles of every board are generated once, and then drawn over and
+over in a single process, as SVG text and as PNG surfaces, bare and solved.
+Saving is timed apart, since it is mostly the PNG encoder and the disk. A
+pool of processes draws about as many pictures per second as this times its
+number of workers.
+"""
+
+import os
+import tempfile
+import time
+
+from app.export import Page, render_png, render_svg, save_png
+from game import Game
+
+BOARDS = [("square", (10, 10)), ("square", (30, 30)), ("hexagon", 10)]
+PUZZLES = 5
+ROUNDS = 40
+SEED = 1
+
+
+def make_records(shape, size) -> list:
+    records = []
+    for seed in range(SEED, SEED + PUZZLES):
+        if shape == "square":
+            game = Game.generate_random_shape(shape, size2=size, seed=seed)
+        else:
+            game = Game.generate_random_shape(shape, size1=size, seed=seed)
+        game.populate_numbers()
+        records.append(game.record())
+    return records
+
+
+def per_picture(draw, records) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for record in records:
+            draw(record)
+    return (time.perf_counter() - start) / (ROUNDS * len(records))
+
+
+def main():
+    pages = (Page(), Page(solution=True))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "puzzle.png")
+        for shape, size in BOARDS:
+            records = make_records(shape, size)
+            print(f"{shape} {size}")
+            for page in pages:
+                kind = "solved" if page.solution else "bare"
+                for name, draw in (
+                    ("svg", lambda r: render_svg(r, page)),
+                    ("png", lambda r: render_png(r, page)),
+                    ("png+save", lambda r: save_png(render_png(r, page), path)),
+                ):
+                    seconds = per_picture(draw, records)
+                    print(
+                        f"  {kind:>6} {name:>8} {seconds * 1e3:>8.2f}ms/picture"
+                        f" {60 / seconds:>10.0f}/minute"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Times growing the loop on rectangles of increasing size.
+
+A size as the argument, e.g. ``200``, stops at a smaller board. The time per
+cell stays flat as the boards grow, which shows that the loop grows in
+linear time.
+"""
+
+import sys
+import time
+
+from generator.shapes import Rectangle
+
+SIZES = [50, 100, 200, 350, 500]
+SEED = 1
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    print(f"{'board':>9} {'cells':>7} {'gen_loop':>10} {'us/cell':>8}")
+    for n in SIZES:
+        if n > largest:
+            break
+        gen = Rectangle.generate((n, n), SEED)
+        start = time.perf_counter()
+        gen.gen_loop()
+        seconds = time.perf_counter() - start
+        cells = len(gen.cells)
+        print(
+            f"{n:>4}x{n:<4} {cells:>7} {seconds:>9.3f}s {seconds / cells * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Times laying boards out in unit space and moving them to pixels.
+
+For a ladder of sizes of each shape, ``build`` is how long
+``board_geometry`` takes the first time a shape and size is drawn, with its
+topology already cached, and ``zoom`` how long moving every junction, edge
+and cell to pixels takes, which is all a zoom lays out again. Every layout
+is checked on the way: all of its edges are equally long, and every cell is
+as far from each of its junctions.
+"""
+
+import time
+import numpy as np
+
+from app.geometry import Transform, board_geometry
+from generator.shapes import Hexagon, Rectangle
+
+SIZES = [
+    (Rectangle, (10, 10)),
+    (Rectangle, (100, 100)),
+    (Rectangle, (300, 300)),
+    (Hexagon, 10),
+    (Hexagon, 50),
+    (Hexagon, 150),
+]
+AREA = (20, 30, 920, 930)
+ZOOMS = 20
+
+
+def check(shape, size, geometry):
+    """Fail unless the layout is regular."""
+    edges = geometry.edges
+    lengths = np.hypot(edges[:, 2] - edges[:, 0], edges[:, 3] - edges[:, 1])
+    assert np.allclose(lengths, lengths[0]), f"{shape.__name__} {size}: edges"
+
+    offsets, corners = shape.topology(size).cell_junctions.numpy()
+    centres = np.repeat(geometry.cells, np.diff(offsets), axis=0)
+    radii = np.hypot(*(geometry.junctions[corners] - centres).T)
+    assert np.allclose(radii, radii[0]), f"{shape.__name__} {size}: cells"
+
+
+def main():
+    board_geometry.cache_clear()
+    for shape, size in SIZES:
+        shape.topology(size)
+        start = time.perf_counter()
+        geometry = board_geometry(shape, size)
+        build = time.perf_counter() - start
+        check(shape, size, geometry)
+
+        start = time.perf_counter()
+        for _ in range(ZOOMS):
+            transform = Transform.fit(geometry.bounds, AREA)
+            transform.segments(geometry.edges)
+            transform.points(geometry.junctions)
+            transform.points(geometry.cells)
+        zoom = (time.perf_counter() - start) / ZOOMS
+        print(
+            f"{shape.shape} {size}: {len(geometry.edges)} edges,"
+            f" build {build * 1e3:.1f}ms, zoom {zoom * 1e3:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
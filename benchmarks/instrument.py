@@ -0,0 +1,40 @@
+"""Measures what instrumentation costs the loop generator.
+
+The same loops are grown without a sink, which is how the generator runs
+by default, and with a ``MemorySink`` that receives the spans and the
+counters of the hot loop. The totals of the counters are printed after.
+"""
+
+import time
+
+from generator.shapes import Rectangle, Hexagon
+from shared import instrument
+
+BOARDS = [(Rectangle, (40, 40)), (Hexagon, 20)]
+SEEDS = range(20)
+
+
+def grow(shape, size) -> float:
+    start = time.perf_counter()
+    for seed in SEEDS:
+        shape.generate(size, seed).gen_loop()
+    return time.perf_counter() - start
+
+
+def main():
+    for shape, size in BOARDS:
+        shape.topology(size)
+        off = grow(shape, size)
+        recorder = instrument.MemorySink()
+        with instrument.use(recorder):
+            on = grow(shape, size)
+        print(
+            f"{shape.__name__} {size}: {off / len(SEEDS) * 1e3:.1f}ms off,"
+            f" {on / len(SEEDS) * 1e3:.1f}ms on"
+        )
+        for name, total in recorder.counters.items():
+            print(f"  {name:>24} {total / len(SEEDS):>10.0f} per loop")
+
+
+if __name__ == "__main__":
+    main()
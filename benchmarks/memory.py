@@ -0,0 +1,49 @@
+"""Measures the memory held by packed boards.
+
+The packed arrays are reported separately from the views, which are
+only created when a list of cells, edges or junctions is asked for.
+"""
+
+import time
+import tracemalloc
+
+from shared.board import Board
+from generator.shapes import Rectangle, Hexagon
+
+
+def rectangle_board(w: int, h: int) -> Board:
+    # Built without the topology cache, so that the build is timed
+    return Board(Rectangle.build_topology((w, h)))
+
+
+def hexagon_board(size: int) -> Board:
+    return Board(Hexagon.build_topology(size))
+
+
+BOARDS = [
+    ("rectangle 100x100", lambda: rectangle_board(100, 100)),
+    ("rectangle 1000x1000", lambda: rectangle_board(1000, 1000)),
+    ("hexagon 60", lambda: hexagon_board(60)),
+]
+
+
+def main():
+    print(f"{'board':>19} {'cells':>8} {'build':>8} {'arrays':>9} {'views':>9}")
+    for name, build_board in BOARDS:
+        start = time.perf_counter()
+        board = build_board()
+        build = time.perf_counter() - start
+
+        tracemalloc.start()
+        board.cells, board.edges, board.junctions
+        views, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{name:>19} {board.num_cells:>8} {build:>7.2f}s"
+            f" {board.nbytes / 1e6:>7.1f}MB {views / 1e6:>7.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
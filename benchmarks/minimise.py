@@ -0,0 +1,33 @@
+"""Times clue minimisation on generated puzzles.
+
+Every board is numbered in full, minimised, and then searched exhaustively
+for a second solution to confirm that the result is still unique.
+"""
+
+from game import Game
+from generator.shapes import Rectangle, Hexagon
+from solver import Solver
+
+BOARDS = [(Rectangle, (10, 10)), (Rectangle, (20, 20)), (Hexagon, 6), (Hexagon, 10)]
+SEEDS = range(3)
+
+
+def main():
+    for shape, size in BOARDS:
+        for seed in SEEDS:
+            gen = shape.generate(size, seed)
+            game = Game(gen, size).start()
+            gen.gen_loop()
+            game.populate_numbers()
+            result = game.minimise_numbers()
+            solutions = Solver(gen.board).count_solutions(2)
+            print(
+                f"{gen.puzzle_id:>18} {result.seconds:>6.2f}s"
+                f"  {result.remaining}/{result.removed + result.remaining} clues"
+                f"  {result.checks} checks, {result.undecided} undecided,"
+                f" unique: {solutions == 1}"
+            )
+
+
+if __name__ == "__main__":
+    main()
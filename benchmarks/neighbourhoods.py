@@ -0,0 +1,77 @@
+"""Profiles the neighbourhood lookups of the loop generator.
+
+Every cell is checked against every neighbour twice: once through the
+precomputed index arrays that ``Generator.valid_cell`` reads, and once
+through the cell views, which build the opposite side from sets on every
+call the way the generator used to. The time and the memory allocated
+while checking are printed for both, followed by a profile of ``gen_loop``.
+"""
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+
+from generator.generator import OPEN
+from generator.shapes import Rectangle, Hexagon
+
+BOARDS = [(Rectangle, (100, 100)), (Hexagon, 30)]
+SEED = 1
+
+
+def check_tables(gen) -> int:
+    state = gen.loop_state
+    offsets, ids = gen.opposite_offsets, gen.opposite_ids
+    found = 0
+    for pair in range(len(gen.neighbour_ids)):
+        for k in range(offsets[pair], offsets[pair + 1]):
+            if state[ids[k]] not in OPEN:
+                break
+        else:
+            found += 1
+    return found
+
+
+def check_views(gen) -> int:
+    state = gen.loop_state
+    found = 0
+    for cell in gen.cells:
+        for neighbour in cell.get_neighbours():
+            if all(
+                state[c.ident] in OPEN for c in cell.get_cells_opposite_side(neighbour)
+            ):
+                found += 1
+    return found
+
+
+def measure(check, gen) -> tuple[int, float, int]:
+    start = time.perf_counter()
+    found = check(gen)
+    seconds = time.perf_counter() - start
+    # Traced separately, since tracing slows every allocation down
+    tracemalloc.start()
+    check(gen)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return found, seconds, peak
+
+
+def main():
+    for shape, size in BOARDS:
+        gen = shape.generate(size, SEED)
+        pairs = len(gen.neighbour_ids)
+        print(f"{shape.__name__} {size}: {pairs} cell/neighbour pairs")
+        for name, check in (("tables", check_tables), ("views", check_views)):
+            found, seconds, peak = measure(check, gen)
+            print(
+                f"  {name:>6} {seconds * 1e9 / pairs:>8.0f}ns/pair"
+                f" {peak / 1024:>9.1f}KiB peak  ({found} open)"
+            )
+
+        profile = cProfile.Profile()
+        profile.runcall(gen.gen_loop)
+        pstats.Stats(profile).sort_stats("tottime").print_stats(6)
+
+
+if __name__ == "__main__":
+    main()
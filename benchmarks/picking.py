@@ -0,0 +1,78 @@
+"""Times finding the edge under a click in the app.
+
+The app is laid out without a window, through SDL's dummy video driver, and
+the same random points are looked up twice: through ``App.edge_at``, which
+only measures the edges the grid index finds around the point, and by
+measuring the distance to every edge. Both have to find the same edges. The
+time it takes to lay out the edges is what starting and every zoom cost.
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from app.app import HIT_THICK  # noqa: E402
+from app.shapes import RectangleApp, HexagonApp  # noqa: E402
+from app.spatial import nearest_segment  # noqa: E402
+from game import Game  # noqa: E402
+from shared.slitherlink import Edge  # noqa: E402
+
+BOARDS = [("square", (30, 30), RectangleApp), ("hexagon", 50, HexagonApp)]
+WINDOW = (900, 900)
+CLICKS = 2000
+SEED = 1
+
+
+def scan(app, pos) -> Edge | None:
+    real_pos = (pos[0] - app.rect.left, pos[1] - app.rect.top)
+    everything = range(len(app.edge_segments))
+    index, distance = nearest_segment(real_pos, app.edge_segments, everything)
+    return app.shape.edges[index] if distance <= HIT_THICK / 2 else None
+
+
+def make_app(shape, size, app_type):
+    if shape == "square":
+        game = Game.generate_random_shape(shape, size2=size, seed=SEED)
+    else:
+        game = Game.generate_random_shape(shape, size1=size, seed=SEED)
+    game.populate_numbers()
+    app = app_type(game, WINDOW)
+    app.start()
+    app.ratio = 1
+    app.draw()
+    return app
+
+
+def main():
+    rng = random.Random(SEED)
+    for shape, size, app_type in BOARDS:
+        start = time.perf_counter()
+        app = make_app(shape, size, app_type)
+        layout = time.perf_counter() - start
+        width, height = app.screen.get_size()
+        points = [(rng.randrange(width), rng.randrange(height)) for _ in range(CLICKS)]
+
+        start = time.perf_counter()
+        indexed = [app.edge_at(p) for p in points]
+        index_time = time.perf_counter() - start
+        start = time.perf_counter()
+        scanned = [scan(app, p) for p in points]
+        scan_time = time.perf_counter() - start
+        assert indexed == scanned, "the index found other edges than the scan"
+
+        hits = sum(e is not None for e in indexed)
+        print(
+            f"{shape} {size}: {len(app.edge_segments)} edges laid out in"
+            f" {layout:.2f}s, {hits}/{CLICKS} clicks hit an edge"
+        )
+        for name, seconds in (("indexed", index_time), ("scanned", scan_time)):
+            print(f"  {name:>8} {seconds / CLICKS * 1e6:>10.1f}us/click")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
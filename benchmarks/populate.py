@@ -0,0 +1,39 @@
+"""Times numbering the cells of generated rectangles.
+
+The vectorized path is timed on every board and the per-cell path on the
+smaller ones, where the numbers of both are also compared.
+"""
+
+import time
+
+from game import Game
+from generator.shapes import Rectangle
+
+SIZES = [100, 300, 1000]
+SCALAR_UP_TO = 300
+SEED = 1
+
+
+def populate(n: int, vectorized: bool) -> tuple[float, bytes]:
+    gen = Rectangle.generate((n, n), SEED)
+    game = Game(gen, (n, n)).start()
+    gen.gen_loop()
+    start = time.perf_counter()
+    game.populate_numbers(vectorized)
+    return time.perf_counter() - start, bytes(gen.board.constraints)
+
+
+def main():
+    print(f"{'board':>11} {'vectorized':>11} {'per cell':>10}")
+    for n in SIZES:
+        seconds, numbers = populate(n, True)
+        scalar = "-"
+        if n <= SCALAR_UP_TO:
+            scalar_seconds, scalar_numbers = populate(n, False)
+            assert numbers == scalar_numbers
+            scalar = f"{scalar_seconds:.3f}s"
+        print(f"{n:>5}x{n:<5} {seconds:>10.3f}s {scalar:>10}")
+
+
+if __name__ == "__main__":
+    main()
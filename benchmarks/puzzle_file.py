@@ -0,0 +1,63 @@
+"""Times writing and randomly reading a large puzzle file.
+
+A few generated puzzles are repeated, with their own seeds, until the file
+holds a million of them. Opening the file only maps it, so reading a
+puzzle costs the same no matter how many puzzles the file holds.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from game import Game
+from generator.puzzle_file import PuzzleReader, PuzzleWriter
+from generator.shapes import Rectangle
+
+COUNT = 1_000_000
+SAMPLES = 10_000
+SIZE = (10, 10)
+
+
+def main():
+    records = []
+    for seed in range(8):
+        gen = Rectangle.generate(SIZE, seed)
+        game = Game(gen, SIZE).start()
+        gen.gen_loop()
+        game.populate_numbers()
+        records.append(game.record())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pack.slk")
+        start = time.perf_counter()
+        with PuzzleWriter(path) as writer:
+            for k in range(COUNT):
+                record = records[k % len(records)]
+                record.seed = k
+                writer.write(record)
+        written = time.perf_counter() - start
+        print(
+            f"wrote {COUNT} puzzles in {written:.2f}s,"
+            f" {os.path.getsize(path) / COUNT:.1f} bytes each"
+        )
+
+        picks = random.Random(1).choices(range(COUNT), k=SAMPLES)
+        start = time.perf_counter()
+        with PuzzleReader(path) as reader:
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            for k in picks:
+                reader.raw(k)
+            raw = time.perf_counter() - start
+            start = time.perf_counter()
+            for k in picks:
+                reader[k]
+            decoded = time.perf_counter() - start
+        print(f"opened in {opened * 1e3:.2f}ms")
+        print(f"raw record     {raw / SAMPLES * 1e6:>6.2f}us per random puzzle")
+        print(f"decoded record {decoded / SAMPLES * 1e6:>6.2f}us per random puzzle")
+
+
+if __name__ == "__main__":
+    main()
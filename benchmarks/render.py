@@ -0,0 +1,103 @@
+"""Times drawing frames of the app.
+
+The app is drawn without a window, through SDL's dummy video driver, at
+every zoom level in ``ZOOMS``. Four kinds of frames are timed: idle frames,
+where nothing changed, frames after a click on an edge, which only draw the
+area around that edge again, frames while panning by ``PAN`` pixels, which
+only draw what came into view, and frames after jumping, which draw
+everything on the screen again. Every frame is drawn with ``App.draw``,
+which returns the areas of the screen that changed, and the area that would
+be updated on the display is summed. ``layout`` is how long laying the board
+out took, which starting and every zoom cost, and ``sprites`` how many
+glyphs and dots the sprite atlas had to make for it.
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from app.shapes import RectangleApp, HexagonApp  # noqa: E402
+from benchmarks.picking import make_app  # noqa: E402
+from shared import instrument  # noqa: E402
+
+BOARDS = [
+    ("square", (30, 30), RectangleApp),
+    ("square", (300, 300), RectangleApp),
+    ("hexagon", 50, HexagonApp),
+]
+ZOOMS = (1, 8)
+FRAMES = 200
+PAN = 8
+SEED = 1
+
+
+def frames(app, before) -> tuple[float, int]:
+    """Draw frames, calling ``before`` ahead of each.
+
+    :return: seconds per frame and changed pixels per frame
+    """
+    pixels = 0
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        before(i)
+        pixels += sum(r.width * r.height for r in app.draw())
+    return (time.perf_counter() - start) / FRAMES, pixels // FRAMES
+
+
+def zoom_to(app, level):
+    """Zoom in on the middle of the screen, redrawing once."""
+    center = app.screen.get_rect().center
+    while app.zoom_level < level:
+        app.zoom(4, center)
+    app.ratio = app.rect.height // app.og_window_size[1]
+    start = time.perf_counter()
+    app.draw()
+    return time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(SEED)
+    for shape, size, app_type in BOARDS:
+        recorder = instrument.MemorySink()
+        start = time.perf_counter()
+        with instrument.use(recorder):
+            app = make_app(shape, size, app_type)
+        layout = time.perf_counter() - start
+
+        def idle(i):
+            pass
+
+        def click(i):
+            app.game.update(rng.choice(app.shape.edges))
+
+        def pan(i):
+            app.rect.move_ip(PAN if i % 20 < 10 else -PAN, PAN if i % 2 else -PAN)
+
+        def jump(i):
+            app.rect.move_ip(1 if i % 2 else -1, 0)
+            app.drawn_view = None
+
+        print(f"{shape} {size}: {len(app.edge_segments)} edges")
+        for level in ZOOMS:
+            if level > 1:
+                recorder = instrument.MemorySink()
+                with instrument.use(recorder):
+                    layout = zoom_to(app, level)
+            detail = "without numbers" if app.lod else "with numbers"
+            sprites = sum(
+                n for name, n in recorder.counters.items() if name.startswith("sprites")
+            )
+            print(f"  zoom {level}, {detail}, layout {layout:.2f}s, {sprites} sprites")
+            kinds = (("idle", idle), ("click", click), ("pan", pan), ("jump", jump))
+            for name, before in kinds:
+                seconds, pixels = frames(app, before)
+                print(f"  {name:>8} {seconds * 1e3:>10.3f}ms/frame {pixels:>10} pixels")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
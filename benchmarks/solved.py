@@ -0,0 +1,51 @@
+"""Times the win check that the app runs on every frame.
+
+Edges of the solution are clicked one at a time, and after every click the
+game is asked whether it is solved, once through the running counts and
+once by scanning every cell and junction the way the check used to.
+"""
+
+import time
+
+from game import Game
+from generator.shapes import Rectangle, Hexagon
+
+BOARDS = [(Rectangle, (20, 20)), (Rectangle, (60, 60)), (Hexagon, 10), (Hexagon, 40)]
+SEED = 1
+
+
+def scan(game: Game) -> bool:
+    return all([c.is_solved() for c in game.shape.cells]) and all(
+        [j.is_valid() for j in game.shape.junctions]
+    )
+
+
+def main():
+    print(f"{'board':>14} {'clicks':>7} {'counted':>12} {'scanned':>12}")
+    for shape, size in BOARDS:
+        gen = shape.generate(size, SEED)
+        game = Game(gen, size).start()
+        gen.gen_loop()
+        game.populate_numbers()
+        clicks = [edge for edge in gen.edges if edge.should_be_selected()]
+
+        counted = scanned = 0.0
+        for edge in clicks:
+            game.update(edge)
+            start = time.perf_counter()
+            game.solved()
+            counted += time.perf_counter() - start
+            start = time.perf_counter()
+            scan(game)
+            scanned += time.perf_counter() - start
+
+        assert game.solved() and scan(game)
+        print(
+            f"{gen.puzzle_id:>14} {len(clicks):>7}"
+            f" {counted / len(clicks) * 1e6:>10.2f}us"
+            f" {scanned / len(clicks) * 1e6:>10.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Times the solver on generated puzzles.
+
+Fully clued puzzles are solved by propagation alone, which prints how many
+edges and cells every rule fixed. Puzzles with part of their clues removed
+are searched for up to two solutions within a node and time budget. Small
+boards without any clues are searched for all of their solutions first,
+which have to be exactly the number of loops they hold.
+"""
+
+import random
+
+from game import Game
+from generator.shapes import Rectangle, Hexagon
+from solver import Solver
+
+BOARDS = [(Rectangle, (10, 10)), (Rectangle, (30, 30)), (Hexagon, 10), (Hexagon, 20)]
+SEARCHES = [(Rectangle, (15, 15), 0.5), (Rectangle, (30, 30), 0.4), (Hexagon, 12, 0.4)]
+# Boards without clues and the number of simple loops on them
+COUNTS = [(Rectangle, (1, 1), 1), (Rectangle, (2, 2), 13), (Rectangle, (3, 3), 213)]
+SEED = 1
+NODE_LIMIT = 5000
+TIME_LIMIT = 10
+
+
+def generate(shape, size):
+    gen = shape.generate(size, SEED)
+    game = Game(gen, size).start()
+    gen.gen_loop()
+    game.populate_numbers()
+    return gen
+
+
+def main():
+    print("Solutions of boards without clues")
+    for shape, size, loops in COUNTS:
+        gen = shape.generate(size, SEED)
+        result = Solver(gen.board).search(loops + 1)
+        assert result.solutions == loops, f"{result.solutions} solutions, not {loops}"
+        print(
+            f"{gen.puzzle_id:>14} {result.status:>13}"
+            f" {result.seconds * 1000:>7.1f}ms  {result.solutions} solutions"
+        )
+
+    print("Propagation")
+    for shape, size in BOARDS:
+        gen = generate(shape, size)
+        result = Solver(gen.board).solve()
+        rules = ", ".join(
+            f"{rule} {stats['edges']}/{stats['cells']}"
+            for rule, stats in result.rules.items()
+            if stats["edges"]
+        )
+        print(
+            f"{gen.puzzle_id:>14} {result.status:>13}"
+            f" {result.seconds * 1000:>7.1f}ms  edges/cells: {rules}"
+        )
+
+    print("Search for two solutions")
+    for shape, size, removed in SEARCHES:
+        gen = generate(shape, size)
+        rng = random.Random(SEED)
+        for cell in gen.cells:
+            if rng.random() < removed:
+                cell.constraint = None
+
+        result = Solver(gen.board).search(2, NODE_LIMIT, TIME_LIMIT)
+        print(
+            f"{gen.puzzle_id:>14} {result.status:>13}"
+            f" {result.seconds * 1000:>7.1f}ms  {result.nodes} nodes,"
+            f" {result.solutions} solutions, {round(removed * 100)}% clues removed"
+        )
+
+
+if __name__ == "__main__":
+    main()
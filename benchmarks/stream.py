@@ -0,0 +1,44 @@
+"""Measures the memory a consumer of a puzzle stream holds on to.
+
+The number of puzzles may be given as the argument. The same puzzles are
+made twice in this process: once consumed one at a time from
+``stream_puzzles``, and once collected into a list first, the way a whole
+batch used to be handed on. The peak traced memory of the first stays flat
+as the count grows, while that of the second grows with it.
+"""
+
+import sys
+import time
+import tracemalloc
+
+from generator.stream import SHAPES, stream_puzzles
+
+SHAPE, SIZE = "square", (20, 20)
+COUNT = 300
+SEED = 1
+
+
+def consume(puzzles) -> int:
+    clues = 0
+    for puzzle in puzzles:
+        clues += int((puzzle.clues >= 0).sum())
+    return clues
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    print(f"{count} puzzles of {SHAPE} {SIZE}")
+    # The shared topology is built before anything is traced
+    SHAPES[SHAPE].topology(SIZE)
+    for name, collect in (("streamed", iter), ("listed", list)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        consume(collect(stream_puzzles(SHAPE, SIZE, count, SEED)))
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:>8} {seconds:>7.2f}s {peak / 1024:>9.1f}KiB peak")
+
+
+if __name__ == "__main__":
+    main()
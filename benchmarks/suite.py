@@ -0,0 +1,225 @@
+"""Benchmarks every phase of making a puzzle across a ladder of sizes.
+
+The phases are:
+
+- ``topology``: building the incidence of the board, opposites included
+- ``generate``: laying a board over it and setting up the generator
+- ``setup``: ``Game.start``, which runs ``Game.setup_variables``
+- ``gen_loop``: growing the loop
+- ``populate_numbers``: numbering the cells
+- ``recount``: selecting the solution and counting the game again
+- ``solved``: ``Game.solved``, the win check the app runs every frame
+
+Every board is made from the same fixed seeds on every run. Each seed runs
+twice: once for the time and once under tracemalloc for the memory, since
+tracing slows every allocation down. The reported time is the best over
+the seeds, which is the least noisy. ``peak`` is the most memory a phase
+held on top of what was allocated before it. ``blocks`` is the number of
+memory blocks the phase left allocated, as counted by
+``sys.getallocatedblocks``.
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --compare before.json --tolerance 0.2
+
+``--quick`` stops at medium sizes. ``--compare`` reads earlier results and
+flags every phase that became slower or used more memory than the
+tolerance allows, and exits with status 1 if there is one.
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+import numpy as np
+
+from game import Game
+from generator.generator import Generator, cached_topology
+from generator.shapes import Rectangle, Hexagon
+from shared.enums import EdgeStatus
+
+RECTANGLES = [(10, 10), (25, 25), (50, 50), (100, 100), (200, 200), (500, 500)]
+HEXAGONS = [5, 10, 20, 40, 80]
+QUICK_CELLS = 5_000
+SEEDS = (1, 2, 3)
+PHASES = (
+    "topology",
+    "generate",
+    "setup",
+    "gen_loop",
+    "populate_numbers",
+    "recount",
+    "solved",
+)
+
+
+class Phases:
+    """Runs the phases of one puzzle, in order, recording each of them."""
+
+    def __init__(self, traced: bool):
+        self.traced = traced
+        self.results: dict[str, dict[str, float]] = {}
+
+    def run(self, name: str, phase: Callable[[], object]) -> object:
+        gc.collect()
+        if not self.traced:
+            start = time.perf_counter()
+            res = phase()
+            self.results[name] = {"seconds": time.perf_counter() - start}
+            return res
+
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        res = phase()
+        _, peak = tracemalloc.get_traced_memory()
+        self.results[name] = {
+            "peak": peak - before,
+            "blocks": sys.getallocatedblocks() - blocks,
+        }
+        return res
+
+
+def select_solution(game: Game) -> None:
+    board = game.shape.board
+    status = np.frombuffer(board.edge_status, dtype=np.uint8)
+    status[board.solution_edges()] = EdgeStatus.SELECTED.value
+    game.recount()
+
+
+def run_puzzle(
+    shape: type[Generator], size, seed: int, traced: bool
+) -> dict[str, dict[str, float]]:
+    phases = Phases(traced)
+    cached_topology.cache_clear()
+    phases.run("topology", lambda: shape.topology(size).opposites)
+    gen = phases.run("generate", lambda: shape.generate(size, seed))
+    game = phases.run("setup", lambda: Game(gen, size).start())
+    phases.run("gen_loop", gen.gen_loop)
+    phases.run("populate_numbers", game.populate_numbers)
+    phases.run("recount", lambda: select_solution(game))
+    if not phases.run("solved", game.solved):
+        raise AssertionError(f"{gen.puzzle_id} is not solved by its own loop")
+    return phases.results
+
+
+def bench(shape: type[Generator], size) -> list[dict]:
+    timed = [run_puzzle(shape, size, seed, False) for seed in SEEDS]
+    tracemalloc.start()
+    try:
+        traced = [run_puzzle(shape, size, seed, True) for seed in SEEDS]
+    finally:
+        tracemalloc.stop()
+
+    cells = shape.topology(size).num_cells
+    rows = []
+    for phase in PHASES:
+        rows.append(
+            {
+                "shape": shape.shape,
+                "size": size,
+                "cells": cells,
+                "phase": phase,
+                "seconds": min(r[phase]["seconds"] for r in timed),
+                "peak": max(r[phase]["peak"] for r in traced),
+                "blocks": max(r[phase]["blocks"] for r in traced),
+            }
+        )
+    return rows
+
+
+def ladder(quick: bool) -> list[tuple[type[Generator], int | tuple[int, int]]]:
+    boards: list[tuple[type[Generator], int | tuple[int, int]]] = []
+    boards += [(Rectangle, size) for size in RECTANGLES]
+    boards += [(Hexagon, size) for size in HEXAGONS]
+    if quick:
+        boards = [(s, size) for s, size in boards if cells(s, size) <= QUICK_CELLS]
+    return boards
+
+
+def cells(shape: type[Generator], size) -> int:
+    if shape is Rectangle:
+        w, h = size
+        return w * h
+    return 3 * size * (size - 1) + 1
+
+
+def key(row: dict) -> tuple:
+    size = row["size"]
+    return row["shape"], tuple(size) if isinstance(size, list) else size, row["phase"]
+
+
+def compare(rows: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """The phases that got worse than a baseline by more than the tolerance.
+
+    Very short phases are left out of the time check, since their times are
+    mostly noise.
+    """
+    before = {key(row): row for row in baseline["results"]}
+    worse = []
+    for row in rows:
+        old = before.get(key(row))
+        if old is None:
+            continue
+        name = f"{row['shape']} {row['size']} {row['phase']}"
+        if old["seconds"] > 5e-3 and row["seconds"] > old["seconds"] * (1 + tolerance):
+            worse.append(f"{name}: {old['seconds']:.4f}s -> {row['seconds']:.4f}s")
+        if old["peak"] > 64 * 1024 and row["peak"] > old["peak"] * (1 + tolerance):
+            worse.append(f"{name}: peak {old['peak']} -> {row['peak']} bytes")
+    return worse
+
+
+def print_rows(rows: list[dict]) -> None:
+    for row in rows:
+        size = row["size"]
+        dims = "x".join(map(str, size)) if isinstance(size, tuple) else size
+        board = f"{row['shape']} {dims}"
+        print(
+            f"{board:>16} {row['phase']:>16} {row['seconds'] * 1e3:>10.2f}ms"
+            f" {row['peak'] / 1024:>10.1f}KiB {row['blocks']:>9}"
+        )
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark every phase.")
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    parser.add_argument("-c", "--compare", help="JSON results to compare against")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.25)
+    parser.add_argument("-q", "--quick", action="store_true", help="skip big boards")
+    args = parser.parse_args(argv)
+
+    print(f"{'board':>16} {'phase':>16} {'time':>12} {'peak':>13} {'blocks':>9}")
+    rows = []
+    for shape, size in ladder(args.quick):
+        board = bench(shape, size)
+        print_rows(board)
+        rows += board
+
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seeds": list(SEEDS),
+        "results": rows,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=1)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            worse = compare(rows, json.load(baseline), args.tolerance)
+        for line in worse:
+            print(f"worse: {line}")
+        if worse:
+            sys.exit(1)
+        print(
+            f"No phase got worse than {args.compare} by more than {args.tolerance:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Times building the board topology and setting up a game.
+
+The time per cell stays flat as the boards grow, which shows that the
+setup is linear in the size of the board.
+"""
+
+import time
+
+from game import Game
+from generator.shapes import Rectangle, Hexagon
+
+RECTANGLES = [(25, 25), (50, 50), (100, 100), (200, 200)]
+HEXAGONS = [8, 15, 30, 60]
+
+
+def bench(shape, size) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    gen = shape.generate(size)
+    built = time.perf_counter()
+    Game(gen, size).start()
+    done = time.perf_counter()
+    return built - start, done - built, len(gen.cells)
+
+
+def main():
+    print(f"{'board':>17} {'cells':>7} {'generate':>10} {'setup':>8} {'us/cell':>8}")
+    for shape, sizes in ((Rectangle, RECTANGLES), (Hexagon, HEXAGONS)):
+        for size in sizes:
+            build, setup, cells = bench(shape, size)
+            dims = "x".join(map(str, size)) if isinstance(size, tuple) else size
+            name = f"{shape.__name__.lower()} {dims}"
+            per_cell = (build + setup) / cells * 1e6
+            print(
+                f"{name:>17} {cells:>7} {build:>9.3f}s {setup:>7.3f}s {per_cell:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Times generating many boards of one shape and size.
+
+The number of boards may be given as the argument. Every board is set up
+twice: once through ``Hexagon.generate``, which shares the cached topology
+and only lays fresh state over it, and once with the topology rebuilt every
+time, the way every board used to be built.
+"""
+
+import sys
+import time
+
+from generator.generator import cached_topology
+from generator.shapes import Hexagon
+from shared.board import Board
+
+SIZE = 20
+COUNT = 1000
+
+
+def cached(seed: int) -> Hexagon:
+    return Hexagon.generate(SIZE, seed)
+
+
+def rebuilt(seed: int) -> Hexagon:
+    return Hexagon(Board(Hexagon.build_topology(SIZE)), SIZE, seed)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    cached_topology.cache_clear()
+    print(f"{count} hexagons of size {SIZE}")
+    for name, generate in (("cached", cached), ("rebuilt", rebuilt)):
+        start = time.perf_counter()
+        for seed in range(count):
+            generate(seed)
+        seconds = time.perf_counter() - start
+        print(f"  {name:>7} {seconds:>7.2f}s {seconds / count * 1e3:>7.2f}ms/board")
+    print(f"  {cached_topology.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Times validating submitted solutions in bulk.
+
+Every batch holds the solution of a generated puzzle and copies of it with
+a few edges flipped, so most submissions fail on one check or another.
+"""
+
+import time
+import numpy as np
+
+from game import Game
+from generator.shapes import Rectangle, Hexagon
+from solver import Validator, pack
+
+BOARDS = [(Rectangle, (10, 10)), (Rectangle, (20, 20)), (Hexagon, 10), (Hexagon, 20)]
+BATCH = 2000
+SEED = 1
+
+
+def submissions(solution: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    batch = np.repeat(solution[None, :], BATCH, axis=0)
+    flips = rng.integers(0, 3, BATCH)
+    for i in np.flatnonzero(flips):
+        batch[i, rng.integers(0, len(solution), flips[i])] ^= True
+    return batch
+
+
+def main():
+    rng = np.random.default_rng(SEED)
+    print(
+        f"{'puzzle':>14} {'edges':>6} {'valid':>6} {'submissions/s':>14} {'packed':>10}"
+    )
+    for shape, size in BOARDS:
+        gen = shape.generate(size, SEED)
+        game = Game(gen, size).start()
+        gen.gen_loop()
+        game.populate_numbers()
+        solution = np.array([edge.should_be_selected() for edge in gen.edges])
+        batch = submissions(solution, rng)
+        packed = pack(batch)
+        validator = Validator(gen.board)
+
+        start = time.perf_counter()
+        result = validator.validate(batch)
+        plain = time.perf_counter() - start
+        start = time.perf_counter()
+        validator.validate_packed(packed)
+        unpacked = time.perf_counter() - start
+
+        print(
+            f"{gen.puzzle_id:>14} {len(solution):>6} {int(result.valid.sum()):>6}"
+            f" {BATCH / plain:>14.0f} {BATCH / unpacked:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Draws puzzles in bulk as SVG and PNG across a pool of processes.
+
+The puzzles come from a pack written by ``batch.py``, either JSON lines or
+a binary puzzle file. Every puzzle is drawn from its stored clues and loop
+alone, without generating or solving anything, and no window is opened.
+The pictures are named after the puzzle IDs, with ``-solution`` for the
+pictures of the loop.
+
+    python export.py pack.jsonl --output pictures
+    python export.py pack.slk --output pictures --format png --solutions
+    python export.py pack.jsonl --output pictures --cell 48 --workers 4
+"""
+
+from __future__ import annotations
+import argparse
+from dataclasses import replace
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator
+
+import numpy as np
+
+from app.export import FORMATS, Page, render_png, render_svg, save_png
+from app.geometry import board_geometry
+from generator.puzzle_file import MAGIC, PuzzleReader, PuzzleRecord
+from generator.puzzle_id import GENERATOR_VERSION
+from generator.stream import SHAPES
+
+
+def record_from_json(data: dict) -> PuzzleRecord:
+    """A puzzle as ``batch.py`` writes it in JSON lines, where a removed
+    clue is null and the solution lists the edges of the loop. Without a
+    ``version`` it is taken to come from the current generator."""
+    shape, size = data["shape"], data["size"]
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape {shape!r}")
+    size = tuple(size) if isinstance(size, list) else size
+    clues = np.array([-1 if c is None else c for c in data["clues"]], dtype=np.int8)
+    solution = np.zeros(len(board_geometry(SHAPES[shape], size).edges), dtype=bool)
+    solution[data["solution"]] = True
+    version = data.get("version", GENERATOR_VERSION)
+    return PuzzleRecord(shape, size, data["seed"], clues, solution, version)
+
+
+def read_puzzles(path: str) -> Iterator[PuzzleRecord]:
+    """The puzzles of a pack, a puzzle file or JSON lines."""
+    with open(path, "rb") as file:
+        binary = file.read(len(MAGIC)) == MAGIC
+    if binary:
+        with PuzzleReader(path) as reader:
+            yield from reader
+        return
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield record_from_json(json.loads(line))
+
+
+def export_puzzle(job: tuple[PuzzleRecord, str, tuple[str, ...], Page]) -> int:
+    """Draw one puzzle in every format and write the pictures.
+
+    :param job: (puzzle, output directory, formats, page)
+    :return: the number of pictures written
+    """
+    record, directory, formats, page = job
+    name = record.puzzle_id + ("-solution" if page.solution else "")
+    path = os.path.join(directory, name)
+    if "svg" in formats:
+        with open(path + ".svg", "w") as file:
+            file.write(render_svg(record, page))
+    if "png" in formats:
+        save_png(render_png(record, page), path + ".png")
+    return len(formats)
+
+
+def export_batch(
+    records: Iterator[PuzzleRecord],
+    directory: str,
+    formats: tuple[str, ...] = FORMATS,
+    page: Page = Page(),
+    solutions: bool = False,
+    workers: int | None = None,
+) -> Iterator[int]:
+    """Draw puzzles on a process pool, yielding as every one is written.
+
+    :param directory: where the pictures go, made if it does not exist
+    :param formats: "svg", "png" or both
+    :param solutions: draw every loop too, next to its puzzle
+    :param workers: the number of processes, defaults to the number of CPUs
+    :return: the number of pictures written for every puzzle
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats {sorted(unknown)}")
+    os.makedirs(directory, exist_ok=True)
+    pages = [page, replace(page, solution=True)] if solutions else [page]
+    jobs = ((r, directory, formats, p) for r in records for p in pages)
+    if workers == 1:
+        yield from map(export_puzzle, jobs)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(export_puzzle, jobs, chunksize=16)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Draw slitherlink puzzles.")
+    parser.add_argument("pack", help="JSON lines or a puzzle file from batch.py")
+    parser.add_argument("-o", "--output", default=".", help="directory")
+    parser.add_argument(
+        "-f", "--format", nargs="+", choices=FORMATS, default=list(FORMATS)
+    )
+    parser.add_argument(
+        "-s", "--solutions", action="store_true", help="draw the loops too"
+    )
+    parser.add_argument("-c", "--cell", type=int, default=Page.cell, help="pixels")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = sum(
+        export_batch(
+            read_puzzles(args.pack),
+            args.output,
+            tuple(args.format),
+            Page(cell=args.cell),
+            args.solutions,
+            args.workers,
+        )
+    )
+    seconds = time.perf_counter() - start
+    rate = written / seconds if seconds > 0 else float("inf")
+    print(
+        f"Drew {written} pictures in {round(seconds, 3)}s ({rate:.1f} pictures/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,174 @@
 from __future__ import annotations
-import time
+import numpy as np
 
-from app.shapes import RectangleApp, HexagonApp
 from generator.shapes import Rectangle, Hexagon
 from generator.generator import Generator
+from generator.puzzle_file import PuzzleRecord
+from generator.puzzle_id import parse_puzzle_id
+from shared import instrument
+from shared.enums import EdgeStatus
+from solver import MinimiseResult, minimise
 
 
 class Game:
     shape: Generator
+    cell_selected: bytearray
+    junction_selected: bytearray
+    num_selected: int
+    unsatisfied: int
+    invalid: int
+    active: int
+    joins: int
+    parent: list[int] | None
+    touched: set[int]
 
     def __init__(self, shape: Generator, size: int | tuple[int, int]):
         self.shape = shape
         self.size = size
+        self.touched = set()
 
-    def populate_numbers(self):
-        for cell in self.shape.cells:
-            cell.loop_status = self.shape.loop[cell]
+    def populate_numbers(self, vectorized: bool = True):
+        """Number every cell from the generated loop.
+
+        :param vectorized: compute all numbers at once with NumPy instead of
+            one :class:`Cell` at a time, both give the same numbers
+        """
+        with instrument.span("populate_numbers", vectorized=vectorized):
+            if vectorized:
+                board = self.shape.board
+                board.loop_status[:] = self.shape.loop_state
+                constraints = board.compute_constraints(board.loop_status)
+                np.frombuffer(board.constraints, dtype=np.int8)[:] = constraints
+                board.update_cell_status()
+            else:
+                for cell in self.shape.cells:
+                    cell.loop_status = self.shape.loop[cell]
+
+                for cell in self.shape.cells:
+                    cell.set_contraint()
+                    cell.update()
+            self.recount()
 
+    def minimise_numbers(self, **kwargs) -> MinimiseResult:
+        """Remove clues while the solution stays unique, after
+        :meth:`populate_numbers`. The order the clues are tried in is drawn
+        from the puzzle's seed, so the result is reproducible.
+
+        :param kwargs: the batch size, budget and probing of :class:`Minimiser`
+        """
+        with instrument.span("minimise") as fields:
+            result = minimise(self.shape.board, self.shape.seed, **kwargs)
+            if fields is not None:
+                fields["removed"] = result.removed
         for cell in self.shape.cells:
-            cell.set_contraint()
             cell.update()
+        self.recount()
+        return result
 
     def set_puzzle(self):
         pass
 
     # Check solution
+    #
+    # The game keeps running counts of the selected edges around every cell
+    # and junction, of the cells that do not match their numbers and of the
+    # junctions with one or more than two selected edges, so that checking
+    # for a win is O(1). The selected edges are also joined in a union-find
+    # over their junctions. Joining is cheap but a deselected edge can not be
+    # split off again, so the union-find is only rebuilt, in one pass over
+    # the selected edges, the next time the components are asked for.
 
     def solved(self) -> bool:
-        return self.solved_cells() and self.valid_junctions()
+        return self.solved_cells() and self.is_single_loop()
 
     def solved_cells(self) -> bool:
-        return all([c.is_solved() for c in self.shape.cells])
+        return self.unsatisfied == 0
 
     def valid_junctions(self) -> bool:
-        return all([j.is_valid() for j in self.shape.junctions])
+        return self.invalid == 0
+
+    def is_single_loop(self) -> bool:
+        """Whether the selected edges form exactly one closed loop."""
+        return self.invalid == 0 and self.num_selected > 0 and self.components == 1
+
+    @property
+    def components(self) -> int:
+        """The number of connected groups of selected edges."""
+        if self.parent is None:
+            self.rejoin()
+        return self.active - self.joins
+
+    def recount(self) -> None:
+        """Count everything from scratch, after numbers or edges were changed
+        without :meth:`update`."""
+        board = self.shape.board
+        cells = board.selected_counts(board.edge_cells, board.num_cells)
+        junctions = board.selected_counts(board.edge_junctions, board.num_junctions)
+        constraints = np.frombuffer(board.constraints, dtype=np.int8)
+        self.cell_selected = bytearray(cells.astype(np.uint8).tobytes())
+        self.junction_selected = bytearray(junctions.astype(np.uint8).tobytes())
+        # Every edge has two junctions
+        self.num_selected = int(junctions.sum()) // 2
+        self.unsatisfied = int(
+            np.count_nonzero((constraints >= 0) & (cells != constraints))
+        )
+        self.invalid = int(np.count_nonzero((junctions != 0) & (junctions != 2)))
+        self.active = int(np.count_nonzero(junctions))
+        self.parent = None
+
+    def rejoin(self) -> None:
+        board = self.shape.board
+        status = board.edge_status
+        selected = EdgeStatus.SELECTED.value
+        self.parent = list(range(board.num_junctions))
+        self.joins = 0
+        for e in range(board.num_edges):
+            if status[e] == selected:
+                self.join(e)
+
+    def join(self, e: int) -> None:
+        parent = self.parent
+        first, second = (self.find(j) for j in self.shape.board.edge_junctions.row(e))
+        if first != second:
+            parent[second] = first
+            self.joins += 1
+
+    def find(self, j: int) -> int:
+        parent = self.parent
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        return j
+
+    def count_edge(self, e: int, selected: bool) -> None:
+        """Adjust the counts for an edge that was selected or deselected, in
+        time proportional to the number of cells and junctions it touches."""
+        board = self.shape.board
+        step = 1 if selected else -1
+        self.num_selected += step
+        for c in board.edge_cells.row(e):
+            constraint = board.constraints[c]
+            count = self.cell_selected[c]
+            self.cell_selected[c] = count + step
+            if constraint >= 0:
+                self.unsatisfied += (count + step != constraint) - (count != constraint)
+        for j in board.edge_junctions.row(e):
+            count = self.junction_selected[j]
+            self.junction_selected[j] = count + step
+            self.active += (count + step > 0) - (count > 0)
+            self.invalid += (count + step not in (0, 2)) - (count not in (0, 2))
+        if not selected:
+            self.parent = None
+        elif self.parent is not None:
+            self.join(e)
 
     # Setup the grid
 
     def setup_variables(self):
-        t = time.perf_counter()
-        for edge in self.shape.edges:
-            edge.setup_variables(self.shape.cells, self.shape.junctions)
-        print(f"The setup of non-edges took {round(time.perf_counter() - t,3)}s")
-        for cell in self.shape.cells:
-            cell.setup_variables()
-        for junction in self.shape.junctions:
-            junction.setup_variables()
+        # The incidence between edges, cells and junctions is already linked
+        # by the board the shape generates, so only the initial statuses are left.
+        with instrument.span("setup"):
+            self.base_update()
 
     # Update the grid
 
@@ -54,15 +177,29 @@ class Game:
             c.update()
         for j in self.shape.junctions:
             j.update()
+        self.recount()
 
     def update(self, edge):
+        selected = edge.is_selected()
         edge.update()
+        self.touched.add(edge.ident)
+        if edge.is_selected() != selected:
+            self.count_edge(edge.ident, not selected)
         for c in edge.cells:
             c.update()
         for j in edge.junctions:
             j.update()
 
+    def take_touched(self) -> set[int]:
+        """The edges changed by :meth:`update` since the last call, e.g. for
+        the app to draw again."""
+        touched, self.touched = self.touched, set()
+        return touched
+
     def play(self, dim, **kwargs):
+        # Imported here so that generating puzzles works without pygame
+        from app.shapes import RectangleApp, HexagonApp
+
         match self.shape.__class__.__name__:
             case "Rectangle":
                 app = RectangleApp(self, dim)
@@ -77,28 +214,61 @@ class Game:
         self.setup_variables()
         return self
 
+    @property
+    def puzzle_id(self) -> str:
+        return self.shape.puzzle_id
+
+    @staticmethod
+    def from_puzzle_id(ident: str) -> Game:
+        """Rebuild a puzzle, including its numbers, from its puzzle ID."""
+        shape, size, seed = parse_puzzle_id(ident)
+        if shape == "square":
+            game = Game.generate_random_shape(shape, size2=size, seed=seed)
+        else:
+            game = Game.generate_random_shape(shape, size1=size, seed=seed)
+        game.populate_numbers()
+        return game
+
+    def record(self) -> PuzzleRecord:
+        """The puzzle as it is stored in a puzzle file."""
+        return self.shape.record()
+
+    @staticmethod
+    def from_record(record: PuzzleRecord) -> Game:
+        """Rebuild a stored puzzle, with its clues and loop as they were
+        saved, without generating anything but the board."""
+        match record.shape:
+            case "square":
+                gen = Rectangle.generate(record.size, record.seed)
+            case "hexagon":
+                gen = Hexagon.generate(record.size, record.seed)
+            case _:
+                raise ValueError(f"Unknown shape {record.shape!r}")
+        gen.load(record)
+        game = Game(gen, record.size)
+        return game.start()
+
     @staticmethod
     def generate_random_shape(
-        shape: str, size1: int = 0, size2: tuple[int, int] = (0, 0)
+        shape: str,
+        size1: int = 0,
+        size2: tuple[int, int] = (0, 0),
+        seed: int | None = None,
     ) -> Game:
+        """Generate a puzzle and its loop, without numbers. Its phases are
+        timed through :mod:`shared.instrument`, nothing is printed."""
         match shape:
             case "square":
                 size = size2
-                gen = Rectangle.generate(size)
+                gen = Rectangle.generate(size, seed)
             case "hexagon":
                 size = size1
-                gen = Hexagon.generate(size)
+                gen = Hexagon.generate(size, seed)
             case _:
                 print("Shape not implemented. Defaulting to rectangle")
                 size = size2
-                gen = Rectangle.generate(size)
+                gen = Rectangle.generate(size, seed)
 
-        START = time.perf_counter()
         game = Game(gen, size).start()
-        print("Setup completed!")
-        SETUP = time.perf_counter()
-        print(f"Setup took {round(SETUP - START,3)}s")
-        print("Starting algorithm..")
         gen.gen_loop()
-        print(f"Shape generation took {round(time.perf_counter() - SETUP,3)}s")
         return game
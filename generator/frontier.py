@@ -0,0 +1,60 @@
+from __future__ import annotations
+from typing import Generic, Hashable, Iterator, TypeVar
+import random
+
+T = TypeVar("T", bound=Hashable)
+
+
+class Frontier(Generic[T]):
+    """A set that picks and removes a random item in O(1).
+
+    The items are kept in a list, with a map from every item to its index
+    in it. Removing an item moves the last item into its place, so the list
+    never has holes and never shifts. The order of the list is not kept,
+    which does not matter since items are only ever picked at random.
+    """
+
+    __slots__ = ("items", "positions")
+
+    items: list[T]
+    positions: dict[T, int]
+
+    def __init__(self, items: Iterator[T] | None = None):
+        self.items = []
+        self.positions = {}
+        for item in items or ():
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.positions
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def add(self, item: T) -> None:
+        """Add an item, unless it is already in the frontier."""
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item: T) -> None:
+        """Remove an item, if it is in the frontier."""
+        index = self.positions.pop(item, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self.positions[last] = index
+
+    def pop_random(self, rng: random.Random) -> T:
+        """Remove and return an item picked uniformly at random.
+
+        :param rng: the random stream to pick with
+        """
+        item = self.items[rng.randrange(len(self.items))]
+        self.discard(item)
+        return item
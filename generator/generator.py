@@ -1,54 +1,91 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import numpy as np
 import random
 from scipy import stats  # type: ignore
 
-from shared.slitherlink import Cell, Junction, Edge
+from generator.frontier import Frontier
+from generator.puzzle_file import PuzzleRecord
+from generator.puzzle_id import puzzle_id
+from shared import instrument
+from shared.board import Board, Topology
+from shared.slitherlink import LOOP_STATUS, Cell, Junction, Edge
 from shared.enums import LoopStatus
 
+UNKNOWN = LoopStatus.UNKNOWN.value
+EXP = LoopStatus.EXP.value
+NOEXP = LoopStatus.NOEXP.value
+OUT = LoopStatus.OUT.value
+OPEN = (UNKNOWN, OUT)
+
+# How many topologies, one per shape and size, are kept around
+TOPOLOGY_CACHE_SIZE = 16
+
 
 class Generator(ABC):
     """
     An abstract class for generating slitherlink puzzles
     """
 
+    shape: str
     size: int | tuple[int, int]
+    seed: int
+    random: random.Random
+    board: Board
     cells: list[Cell]
-    junctions: list[Junction]
-    edges: set[Edge]
-    available: list[Cell]
+    available: Frontier[int]
+    loop_state: bytearray
     loop: dict[Cell, LoopStatus]
 
     def __init__(
-        self,
-        cells: list[Cell],
-        junctions: list[Junction],
-        edges: set[Edge],
-        size: int | tuple[int, int],
+        self, board: Board, size: int | tuple[int, int], seed: int | None = None
     ):
         """_summary_
 
-        :param cells: '_description_'
-        :type cells: list[Cell]
-        :param junctions: _description_
-        :type junctions: list[Junction]
+        :param board: the packed board whose cells and junctions are used
+        :type board: Board
+        :param size: the size of the shape
+        :type size: int | tuple[int, int]
+        :param seed: the seed of the generator's own random stream, a fresh
+            one is drawn from the system when left out
+        :type seed: int | None
         """
 
         self.size = size
-        self.cells = cells
-        self.junctions = junctions
-        self.edges = edges
-        self.edges_arr = list(edges)
-        self.available = []
-        self.loop = {k: LoopStatus.UNKNOWN for k in dict.fromkeys(cells)}
-        self.solution = {k: LoopStatus.UNKNOWN for k in dict.fromkeys(cells)}
+        self.seed = seed if seed is not None else new_seed()
+        self.random = random.Random(self.seed)
+        self.board = board
+        self.cells = board.cells
+        self.available = Frontier()
+        self.loop_state = bytearray([UNKNOWN]) * board.num_cells
+        self.neighbour_offsets = board.cell_neighbours.offsets
+        self.neighbour_ids = board.cell_neighbours.indices
+        self.opposite_offsets = board.opposites.offsets
+        self.opposite_ids = board.opposites.indices
+        self.loop = {k: LoopStatus.UNKNOWN for k in dict.fromkeys(self.cells)}
+        self.solution = {k: LoopStatus.UNKNOWN for k in dict.fromkeys(self.cells)}
+
+    # The loop only needs the cells, the other views are left to the board
+    # to create when they are first asked for
+
+    @property
+    def junctions(self) -> list[Junction]:
+        return self.board.junctions
+
+    @property
+    def edges(self) -> list[Edge]:
+        return self.board.edges
+
+    @property
+    def edges_arr(self) -> list[Edge]:
+        return self.board.edges
 
     @abstractmethod
     def pick_first_cell(self) -> Cell:
-        return random.choice(list(self.cells))
+        return self.random.choice(list(self.cells))
 
     def probability_line(self, width: int) -> list[float]:
-        return stats.norm.pdf(np.linspace(-3, 3, width))
+        return normal_line(width)
 
     @abstractmethod
     def print_ascii(self):
@@ -58,92 +95,220 @@ class Generator(ABC):
     def print_numbers(self):
         return NotImplemented
 
+    @property
+    def puzzle_id(self) -> str:
+        return puzzle_id(self.shape, self.size, self.seed)
+
+    def record(self) -> PuzzleRecord:
+        """The clues of the board and the solution of the loop, to be stored
+        in a puzzle file."""
+        board = self.board
+        clues = np.frombuffer(board.constraints, dtype=np.int8).copy()
+        solution = board.solution_edges(self.loop_state)
+        return PuzzleRecord(self.shape, self.size, self.seed, clues, solution)
+
+    def load(self, record: PuzzleRecord) -> None:
+        """Take the clues and the loop of a stored puzzle instead of
+        generating them, since the loop is rebuilt from its edges."""
+        board = self.board
+        if len(record.clues) != board.num_cells:
+            raise ValueError(f"{record.puzzle_id} does not fit this board")
+        self.loop_state[:] = board.loop_from_solution(record.solution).tobytes()
+        board.loop_status[:] = self.loop_state
+        np.frombuffer(board.constraints, dtype=np.int8)[:] = record.clues
+        self.loop = dict(zip(self.cells, map(LOOP_STATUS.__getitem__, self.loop_state)))
+        self.solution = self.loop.copy()
+
+    @classmethod
+    def generate(cls, size: int | tuple[int, int], seed: int | None = None):
+        return NotImplemented
+
     @classmethod
-    def generate(cls, size: int | tuple[int, int]):
+    def topology(cls, size: int | tuple[int, int]) -> Topology:
+        """The topology of the shape at a size. It is built the first time
+        and shared by every board of the same shape and size after that, so
+        :meth:`generate` only lays fresh state over it."""
+        return cached_topology(cls, size)
+
+    @classmethod
+    def build_topology(cls, size: int | tuple[int, int]) -> Topology:
         return NotImplemented
 
     def gen_loop(self):
-        self.available.append(self.pick_first_cell())
+        """Grow the loop from a random first cell.
+
+        The hot loop works on cell ids only. It reads the neighbours of every
+        cell and the cells opposite every neighbour straight from the index
+        arrays of the board, and keeps the status of every cell in a byte
+        array, so a step allocates nothing. :attr:`loop` is filled in once
+        the loop is done.
+        """
+        with instrument.span("gen_loop", cells=self.board.num_cells) as fields:
+            if fields is None:
+                self.grow_loop()
+            else:
+                self.count_loop(fields)
+
+        self.loop = dict(zip(self.cells, map(LOOP_STATUS.__getitem__, self.loop_state)))
+        self.solution = self.loop.copy()
+
+    def grow_loop(self):
+        state = self.loop_state
+        self.available.add(self.pick_first_cell().ident)
 
-        while len(self.available) > 0:
-            cell = random.choice(self.available)
-            self.available.remove(cell)
+        while self.available:
+            cell = self.available.pop_random(self.random)
 
             next_cell = self.add_cell(cell)
 
-            if self.loop[cell] == LoopStatus.EXP:
+            if state[cell] == EXP:
                 self.add_available(cell)
 
-            if self.loop[next_cell] == LoopStatus.EXP:
+            if state[next_cell] == EXP:
                 self.add_available(next_cell)
 
-        for keys in self.loop.keys():
-            if self.loop[keys] == LoopStatus.UNKNOWN:
-                self.loop[keys] = LoopStatus.OUT
+        for c, status in enumerate(state):
+            if status == UNKNOWN:
+                state[c] = OUT
 
-        self.solution = self.loop.copy()
+    def count_loop(self, fields: dict) -> None:
+        """:meth:`grow_loop` with counters around its hot methods, which are
+        only put in place while something listens.
+
+        :param fields: the fields of the ``gen_loop`` span, which gets the
+            largest size of the frontier
+        """
+        valid_cell, add_available = self.valid_cell, self.add_available
+        calls = rejected = added = peak = 0
+
+        def counted_valid_cell(next_cell: int, cell: int, pair: int | None = None):
+            nonlocal calls, rejected
+            calls += 1
+            if valid_cell(next_cell, cell, pair):
+                return True
+            rejected += 1
+            return False
 
-    def add_cell(self, cell: Cell) -> Cell:
+        def counted_add_available(cell: int) -> None:
+            nonlocal added, peak
+            add_available(cell)
+            added += 1
+            peak = max(peak, len(self.available))
+
+        self.valid_cell = counted_valid_cell  # type: ignore[method-assign]
+        self.add_available = counted_add_available  # type: ignore[method-assign]
+        try:
+            self.grow_loop()
+        finally:
+            del self.valid_cell, self.add_available
+
+        fields["frontier_peak"] = peak
+        instrument.count("gen_loop.valid_cell", calls)
+        instrument.count("gen_loop.rejected", rejected)
+        instrument.count("gen_loop.frontier_added", added)
+
+    def add_cell(self, cell: int) -> int:
+        state = self.loop_state
         # can loop expand from current cell?
         if not self.is_expandable(cell):
             return cell
 
         new_cell = self.pick_direction(cell)
 
-        if self.loop[new_cell] != LoopStatus.UNKNOWN:
+        if state[new_cell] != UNKNOWN:
             return cell
 
-        new_neighbours = self.get_adjacent(new_cell)
-        if not any(new_neighbours):
-            self.loop[new_cell] = LoopStatus.OUT
+        if not self.has_adjacent(new_cell):
+            state[new_cell] = OUT
             return new_cell
 
         if self.valid_cell(new_cell, cell):
-            self.loop[new_cell] = LoopStatus.EXP
+            state[new_cell] = EXP
         else:
-            self.loop[new_cell] = LoopStatus.OUT
+            state[new_cell] = OUT
 
         return new_cell
 
-    def is_expandable(self, cell: Cell) -> bool:
-        neighbours = self.get_adjacent(cell)
-
-        if not any(neighbours):
-            self.loop[cell] = LoopStatus.NOEXP
+    def is_expandable(self, cell: int) -> bool:
+        if not self.has_adjacent(cell):
+            self.loop_state[cell] = NOEXP
             return False
 
         return True
 
-    def pick_direction(self, cell: Cell) -> Cell:
-        return random.choice(cell.get_neighbours())
+    def pick_direction(self, cell: int) -> int:
+        start = self.neighbour_offsets[cell]
+        degree = self.neighbour_offsets[cell + 1] - start
+        return self.neighbour_ids[start + self.random.randrange(degree)]
+
+    def has_adjacent(self, cell: int) -> bool:
+        """Whether the loop can grow from a cell into any of its neighbours.
+
+        Every neighbour is checked, since :meth:`valid_cell` marks the ones
+        it rejects.
+        """
+        ids = self.neighbour_ids
+        found = False
+        for k in range(self.neighbour_offsets[cell], self.neighbour_offsets[cell + 1]):
+            if self.valid_cell(ids[k], cell, k):
+                found = True
+        return found
+
+    def add_available(self, cell: int) -> None:
+        self.available.add(cell)
+
+    def valid_cell(self, next_cell: int, cell: int, pair: int | None = None) -> bool:
+        """Whether the loop can grow from a cell into its neighbour, which
+        needs the neighbour to be unknown and every cell on its far side to
+        be outside the loop so far.
+
+        :param pair: the index of the neighbour in the neighbour array, looked
+            up when left out
+        """
+        state = self.loop_state
+        if state[next_cell] != UNKNOWN:
+            return False
 
-    def get_adjacent(self, cell: Cell) -> list[bool]:
-        neighbours = cell.get_neighbours()
-        return [self.valid_cell(n, cell) for n in neighbours]
+        if pair is None:
+            pair = self.pair(cell, next_cell)
+        opposite = self.opposite_ids
+        for k in range(self.opposite_offsets[pair], self.opposite_offsets[pair + 1]):
+            if state[opposite[k]] not in OPEN:
+                state[next_cell] = OUT
+                return False
 
-    def add_available(self, cell: Cell) -> None:
-        for c in self.available:
-            if c is cell:
-                return
-        self.available.append(cell)
+        return True
 
-    def valid_cell(self, next_cell: Cell, cell: Cell) -> bool:
-        valid = True
+    def pair(self, cell: int, neighbour: int) -> int:
+        """The index of a neighbour of a cell in the neighbour array."""
+        ids = self.neighbour_ids
+        for k in range(self.neighbour_offsets[cell], self.neighbour_offsets[cell + 1]):
+            if ids[k] == neighbour:
+                return k
+        raise ValueError(f"Cell {neighbour} is not next to cell {cell}")
 
-        valid = valid and self.loop[next_cell] != LoopStatus.NOEXP
-        valid = valid and self.loop[next_cell] != LoopStatus.OUT
-        valid = valid and self.loop[next_cell] != LoopStatus.EXP
+    def cell_open(self, cell: int) -> bool:
+        return self.loop_state[cell] in OPEN
+
+
+@lru_cache(maxsize=TOPOLOGY_CACHE_SIZE)
+def cached_topology(shape: type[Generator], size: int | tuple[int, int]) -> Topology:
+    """Build the topology of a shape at a size, keeping the most recently
+    used ones. ``cached_topology.cache_info()`` shows how often it was hit.
+    """
+    with instrument.span("topology", shape=shape.shape, size=size):
+        return shape.build_topology(size)
 
-        for n in cell.get_cells_opposite_side(next_cell):
-            valid = valid and self.cell_open(n)
 
-        if not valid and self.loop[next_cell] == LoopStatus.UNKNOWN:
-            self.loop[next_cell] = LoopStatus.OUT
+@lru_cache(maxsize=256)
+def normal_line(width: int) -> np.ndarray:
+    """The normal density over a row of cells, the same for every puzzle of
+    a size. It is shared, so it must not be changed."""
+    return stats.norm.pdf(np.linspace(-3, 3, width))
 
-        return valid
 
-    def cell_open(self, cell: Cell) -> bool:
-        return self.loop[cell] in [LoopStatus.UNKNOWN, LoopStatus.OUT]
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(64)
 
 
 def flatten(lst: list[list]) -> list:
@@ -0,0 +1,203 @@
+"""A compact binary file format for many puzzles.
+
+A puzzle file starts with a header, followed by the puzzle records and a
+fixed-size index, all little-endian::
+
+    header   magic "SLKP", format version (u16), reserved (u16),
+             number of puzzles (u64), offset of the index (u64)
+    records  one after another, see below
+    index    the offset of every record plus the end of the last one (u64)
+
+Every record holds the shape code, the generator version, the size and the
+seed of the puzzle, its number of cells and edges, the clues packed two to a
+byte (a nibble of 15 for a cell without a number) and the solution as a bit
+per edge. The index has a fixed size per puzzle, so a reader memory-maps the
+file and finds puzzle ``k`` with two lookups and no parsing at all.
+"""
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import IO, Iterator
+import mmap
+import struct
+import numpy as np
+
+from generator.puzzle_id import (
+    CODE_SHAPES,
+    GENERATOR_VERSION,
+    SHAPE_CODES,
+    puzzle_id,
+)
+
+MAGIC = b"SLKP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+RECORD = struct.Struct("<cBHHQII")
+NO_CLUE = 15
+
+
+@dataclass
+class PuzzleRecord:
+    """One puzzle as it is stored in a puzzle file.
+
+    ``clues`` holds the number of every cell, -1 for none, and ``solution``
+    whether every edge is part of the loop.
+    """
+
+    shape: str
+    size: int | tuple[int, int]
+    seed: int
+    clues: np.ndarray
+    solution: np.ndarray
+    version: int = GENERATOR_VERSION
+
+    @property
+    def puzzle_id(self) -> str:
+        return puzzle_id(self.shape, self.size, self.seed, self.version)
+
+    def encode(self) -> bytes:
+        if self.clues.max(initial=0) >= NO_CLUE:
+            raise ValueError(f"Clues have to be below {NO_CLUE} to be packed")
+        w, h = self.size if isinstance(self.size, tuple) else (self.size, 0)
+        if not (0 <= w <= 0xFFFF and 0 <= h <= 0xFFFF):
+            raise ValueError(
+                f"Sizes have to fit in 16 bits to be packed, not {self.size}"
+            )
+        if not 0 <= self.seed < 1 << 64:
+            raise ValueError(
+                f"Seeds have to fit in 64 bits to be packed, not {self.seed}"
+            )
+        header = RECORD.pack(
+            SHAPE_CODES[self.shape].encode(),
+            self.version,
+            w,
+            h,
+            self.seed,
+            len(self.clues),
+            len(self.solution),
+        )
+        nibbles = np.where(self.clues < 0, NO_CLUE, self.clues).astype(np.uint8)
+        if len(nibbles) % 2:
+            nibbles = np.append(nibbles, np.uint8(NO_CLUE))
+        clues = nibbles[0::2] | (nibbles[1::2] << 4)
+        solution = np.packbits(self.solution.astype(bool), bitorder="little")
+        return header + clues.tobytes() + solution.tobytes()
+
+    @classmethod
+    def decode(cls, buffer: bytes | memoryview) -> PuzzleRecord:
+        code, version, w, h, seed, cells, edges = RECORD.unpack_from(buffer)
+        shape = CODE_SHAPES[code.decode()]
+        size = (w, h) if shape == "square" else w
+
+        start = RECORD.size
+        packed = np.frombuffer(buffer, np.uint8, (cells + 1) // 2, start)
+        nibbles = np.empty(len(packed) * 2, dtype=np.int8)
+        nibbles[0::2] = packed & 0x0F
+        nibbles[1::2] = packed >> 4
+        clues = nibbles[:cells]
+        clues[clues == NO_CLUE] = -1
+
+        start += len(packed)
+        bits = np.frombuffer(buffer, np.uint8, (edges + 7) // 8, start)
+        solution = np.unpackbits(bits, count=edges, bitorder="little").astype(bool)
+        return cls(shape, size, seed, clues, solution, version)
+
+
+class PuzzleWriter:
+    """Streams puzzle records into a new puzzle file.
+
+    The index is kept in memory, at 8 bytes per puzzle, and written out
+    together with the final header when the writer is closed.
+
+        with PuzzleWriter("pack.slk") as writer:
+            writer.write(game.record())
+    """
+
+    def __init__(self, path: str):
+        self.file: IO[bytes] = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, 0))
+        self.offsets = array("Q", [HEADER.size])
+
+    def __enter__(self) -> PuzzleWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def write(self, record: PuzzleRecord | bytes) -> None:
+        """Append a record, or one that was already encoded, e.g. by a
+        worker process."""
+        data = record if isinstance(record, bytes) else record.encode()
+        self.file.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.file.write(self.offsets.tobytes())
+        self.file.seek(0)
+        self.file.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self), self.offsets[-1])
+        )
+        self.file.close()
+
+
+class PuzzleReader:
+    """Serves the puzzles of a puzzle file through a memory map.
+
+    Nothing is read up front besides the header. :meth:`raw` returns the
+    bytes of a record without copying, e.g. to send them on as they are,
+    and indexing decodes a single record.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, index = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path!r} is not a puzzle file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f"{path!r} has format version {version}, "
+                f"this is version {FORMAT_VERSION}"
+            )
+        self.view = memoryview(self.mmap)
+        self.offsets = np.frombuffer(self.mmap, "<u8", count + 1, index)
+
+    def __enter__(self) -> PuzzleReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k: int) -> PuzzleRecord:
+        return PuzzleRecord.decode(self.raw(k))
+
+    def __iter__(self) -> Iterator[PuzzleRecord]:
+        for k in range(len(self)):
+            yield self[k]
+
+    def raw(self, k: int) -> memoryview:
+        """The encoded record of puzzle ``k``, which points into the file and
+        is only valid until the reader is closed."""
+        if not -len(self) <= k < len(self):
+            raise IndexError(f"Puzzle {k} is out of range")
+        k %= len(self)
+        return self.view[self.offsets[k] : self.offsets[k + 1]]
+
+    def close(self) -> None:
+        # The views have to go before the map they point into
+        self.offsets = np.empty(1, dtype="<u8")
+        if hasattr(self, "view"):
+            self.view.release()
+        self.mmap.close()
+        self.file.close()
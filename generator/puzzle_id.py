@@ -0,0 +1,65 @@
+"""Compact keys that identify a generated puzzle.
+
+A puzzle ID encodes the generator version, the shape, the size and the seed,
+e.g. ``2R10x10-5f3a`` or ``2H20-9c1`` (the seed is hexadecimal). Generation is
+deterministic for a given seed, so a puzzle can always be rebuilt from its ID
+instead of being stored.
+"""
+
+import re
+
+# Bump this whenever a change to the generator makes the same seed produce a
+# different puzzle, so that stale IDs are rejected instead of rebuilt wrongly.
+GENERATOR_VERSION = 2
+
+SHAPE_CODES = {"square": "R", "hexagon": "H"}
+CODE_SHAPES = {code: shape for shape, code in SHAPE_CODES.items()}
+
+PUZZLE_ID = re.compile(r"^(\d+)([A-Z])(\d+)(?:x(\d+))?-([0-9a-f]+)$")
+
+
+def puzzle_id(
+    shape: str,
+    size: int | tuple[int, int],
+    seed: int,
+    version: int = GENERATOR_VERSION,
+) -> str:
+    """Encode a puzzle as a compact ID.
+
+    :param shape: "square" or "hexagon"
+    :param size: (width, height) of a rectangle or the side of a hexagon
+    :param seed: the seed the puzzle was generated with
+    :param version: the generator version the puzzle was generated with, by
+        default the current one
+    :return: the puzzle ID
+    """
+    if shape not in SHAPE_CODES:
+        raise ValueError(f"Unknown shape {shape!r}")
+    if seed < 0:
+        raise ValueError("The seed has to be non-negative")
+    dims = "x".join(map(str, size)) if isinstance(size, tuple) else str(size)
+    return f"{version}{SHAPE_CODES[shape]}{dims}-{seed:x}"
+
+
+def parse_puzzle_id(ident: str) -> tuple[str, int | tuple[int, int], int]:
+    """Decode a puzzle ID made by :func:`puzzle_id`.
+
+    :param ident: the puzzle ID
+    :return: (shape, size, seed)
+    """
+    match = PUZZLE_ID.match(ident)
+    if match is None:
+        raise ValueError(f"Malformed puzzle ID {ident!r}")
+    version, code, first, second, seed = match.groups()
+    if int(version) != GENERATOR_VERSION:
+        raise ValueError(
+            f"Puzzle ID {ident!r} was made by generator version {version}, "
+            f"this is version {GENERATOR_VERSION}"
+        )
+    if code not in CODE_SHAPES:
+        raise ValueError(f"Unknown shape code {code!r} in {ident!r}")
+    shape = CODE_SHAPES[code]
+    if (shape == "square") != (second is not None):
+        raise ValueError(f"Malformed size in puzzle ID {ident!r}")
+    size = (int(first), int(second)) if second is not None else int(first)
+    return shape, size, int(seed, 16)
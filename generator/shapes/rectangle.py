@@ -1,7 +1,7 @@
-import random
-from typing import Self
+from typing import Iterator, Self
 
-from shared.slitherlink import Cell, Edge, Junction
+from shared.board import Board, Incidence, Topology
+from shared.slitherlink import Cell
 from generator.generator import Generator
 
 
@@ -12,22 +12,19 @@ class Rectangle(Generator):
     :param Generator: The parent class
     """
 
-    def __init__(
-        self,
-        cells: list[Cell],
-        junctions: list[Junction],
-        edges: set[Edge],
-        w: int,
-        h: int,
-    ):
+    shape = "square"
+
+    def __init__(self, board: Board, w: int, h: int, seed: int | None = None):
         """Initialises a rectangular shaped slitherlink puzzle
-        that takes the cells and junctions as parameters.
+        that takes the board of cells and junctions as parameter.
 
-        :param cells:
-        :param junctions: _description_
+        :param board: the packed board of the rectangle
+        :param w: the width of the rectangle
+        :param h: the height of the rectangle
+        :param seed: the seed of the random stream of the generator
         """
 
-        super().__init__(cells, junctions, edges, (w, h))
+        super().__init__(board, (w, h), seed)
         self.w = w
         self.h = h
 
@@ -35,7 +32,7 @@ class Rectangle(Generator):
         xs = self.probability_line(self.w)
         ys = self.probability_line(self.h)
         probabilities = [y * x for y in ys for x in xs]
-        return random.choices(self.cells, weights=probabilities, k=1)[0]
+        return self.random.choices(self.cells, weights=probabilities, k=1)[0]
 
     def print_ascii(self):
         lst = [val.value for val in self.loop.values()]
@@ -68,39 +65,57 @@ class Rectangle(Generator):
                 print(f"{self.cells[i].constraint} ", end="")
 
     @classmethod
-    def generate(cls, size: tuple[int, int]) -> Self:
+    def generate(cls, size: tuple[int, int], seed: int | None = None) -> Self:
+        w, h = size
+        return Rectangle(Board(cls.topology((w, h))), w, h, seed)
+
+    @classmethod
+    def build_topology(cls, size: tuple[int, int]) -> Topology:
         w, h = size
-        length = w * h + w
-        edges = [Edge(i) for i in range(2 * w * h + w + h)]
-
-        cells = []
-        for j in range(h):
-            for i in range(w):
-                index = j * w + i  # index of the cell
-                connected_indices = [
-                    index,  # up
-                    length + index + j + 1,  # right
-                    index + w,  # down
-                    length + index + j,  # left
-                ]
-                connected_edges = [edges[k] for k in connected_indices]
-                cells.append(Cell(connected_edges, index, 4))
-
-        junctions = []
-        for j in range(h + 1):
-            for i in range(w + 1):
-                index = j * (w + 1) + i  # index of the junction
-                connected_indices = []
-                if j != 0:  # up
-                    connected_indices.append(length + index - w - 1)
-                if i != w:  # right
-                    connected_indices.append(index - j)
-                if j != h:  # down
-                    connected_indices.append(length + index)
-                if i != 0:  # left
-                    connected_indices.append(index - j - 1)
-
-                connected_edges = [edges[k] for k in connected_indices]
-                junctions.append(Junction(connected_edges, index))
-
-        return Rectangle(cells, junctions, {e for e in edges}, w, h)
+        return Topology(
+            2 * w * h + w + h,
+            Incidence.from_rows(cell_edges(w, h)),
+            Incidence.from_rows(junction_edges(w, h)),
+        )
+
+
+def cell_edges(w: int, h: int) -> Iterator[list[int]]:
+    """Yields the edge indices of every cell, row by row.
+
+    :param w: the width of the rectangle
+    :param h: the height of the rectangle
+    :return: (up, right, down, left) for every cell
+    """
+    length = w * h + w
+    for j in range(h):
+        for i in range(w):
+            index = j * w + i  # index of the cell
+            yield [
+                index,  # up
+                length + index + j + 1,  # right
+                index + w,  # down
+                length + index + j,  # left
+            ]
+
+
+def junction_edges(w: int, h: int) -> Iterator[list[int]]:
+    """Yields the edge indices of every junction, row by row.
+
+    :param w: the width of the rectangle
+    :param h: the height of the rectangle
+    :return: the existing edges of (up, right, down, left) for every junction
+    """
+    length = w * h + w
+    for j in range(h + 1):
+        for i in range(w + 1):
+            index = j * (w + 1) + i  # index of the junction
+            connected_indices = []
+            if j != 0:  # up
+                connected_indices.append(length + index - w - 1)
+            if i != w:  # right
+                connected_indices.append(index - j)
+            if j != h:  # down
+                connected_indices.append(length + index)
+            if i != 0:  # left
+                connected_indices.append(index - j - 1)
+            yield connected_indices
@@ -0,0 +1,193 @@
+"""Streams generated puzzles one at a time.
+
+:func:`stream_puzzles` is a generator, so a puzzle is only made once the
+consumer asks for it, with worker processes at most a few puzzles ahead.
+Nothing is printed, and the puzzles are dropped as soon as the consumer is
+done with them, so a pipeline of minimising, rating and writing never holds
+more than a handful of puzzles at once.
+
+    for puzzle in stream_puzzles("hexagon", 20, count=1000, min_coverage=0.4):
+        writer.write(puzzle.record())
+
+Every puzzle gets its own seed, drawn from one base seed in the same way as
+:mod:`batch` does, and the puzzles come out in the order of their seeds
+whatever the number of workers, so a stream can always be reproduced.
+"""
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterator
+import multiprocessing
+import os
+import random
+import numpy as np
+
+from generator.generator import new_seed
+from generator.puzzle_file import PuzzleRecord
+from generator.puzzle_id import puzzle_id
+from generator.shapes import Rectangle, Hexagon
+from shared import instrument
+from shared.board import Board, Topology
+from shared.enums import LoopStatus
+from solver import minimise
+
+SHAPES = {"square": Rectangle, "hexagon": Hexagon}
+
+
+@dataclass
+class Puzzle:
+    """A finished puzzle, without any views or game state.
+
+    ``topology`` is shared by every puzzle of the same shape and size,
+    ``loop`` holds the :class:`LoopStatus` value of every cell and ``clues``
+    the number of every cell, -1 for none. Both arrays are read-only.
+    """
+
+    shape: str
+    size: int | tuple[int, int]
+    seed: int
+    topology: Topology
+    loop: np.ndarray
+    clues: np.ndarray
+
+    @property
+    def puzzle_id(self) -> str:
+        return puzzle_id(self.shape, self.size, self.seed)
+
+    @property
+    def coverage(self) -> float:
+        """The share of the cells that is inside the loop."""
+        return coverage(self.loop)
+
+    def board(self) -> Board:
+        """A fresh board with the clues and the loop of the puzzle."""
+        board = Board(self.topology)
+        np.frombuffer(board.constraints, dtype=np.int8)[:] = self.clues
+        board.loop_status[:] = self.loop.tobytes()
+        return board
+
+    def record(self) -> PuzzleRecord:
+        """The puzzle as it is stored in a puzzle file."""
+        solution = Board(self.topology).solution_edges(self.loop.tobytes())
+        return PuzzleRecord(self.shape, self.size, self.seed, self.clues, solution)
+
+
+def coverage(loop: bytes | np.ndarray) -> float:
+    status = np.frombuffer(loop, dtype=np.uint8)
+    return np.count_nonzero(status == LoopStatus.NOEXP.value) / len(status)
+
+
+def seed_stream(seed: int | None = None) -> Iterator[int]:
+    """Draw independent 64-bit seeds, one per puzzle, without end."""
+    rng = random.Random(seed if seed is not None else new_seed())
+    while True:
+        yield rng.getrandbits(64)
+
+
+def make_puzzle(
+    job: tuple[str, int | tuple[int, int], int, bool, float, float],
+) -> tuple[bytes, bytes] | None:
+    """Generate the loop and the clues of one puzzle without any output.
+
+    The loop is checked against the filters before it is numbered, so a
+    rejected puzzle costs no more than its loop.
+
+    :param job: (shape, size, seed, whether to minimise the clues, the
+        smallest and the largest coverage of the loop)
+    :return: (loop, clues) as bytes, or None when the loop was rejected
+    """
+    shape, size, seed, minimised, min_coverage, max_coverage = job
+    gen = SHAPES[shape].generate(size, seed)
+    gen.gen_loop()
+    if not min_coverage <= coverage(gen.loop_state) <= max_coverage:
+        return None
+    board = gen.board
+    with instrument.span("populate_numbers", vectorized=True):
+        clues = board.compute_constraints(gen.loop_state)
+        np.frombuffer(board.constraints, dtype=np.int8)[:] = clues
+    if minimised:
+        with instrument.span("minimise") as fields:
+            result = minimise(board, seed)
+            if fields is not None:
+                fields["removed"] = result.removed
+    return bytes(gen.loop_state), board.constraints.tobytes()
+
+
+def stream_puzzles(
+    shape: str,
+    size: int | tuple[int, int],
+    count: int | None = None,
+    seed: int | None = None,
+    workers: int | None = 1,
+    prefetch: int | None = None,
+    min_coverage: float = 0.0,
+    max_coverage: float = 1.0,
+    minimised: bool = False,
+    accept: Callable[[Puzzle], bool] | None = None,
+) -> Iterator[Puzzle]:
+    """Generate puzzles lazily, in the order of their seeds.
+
+    A filter that rejects every puzzle makes the stream run forever, as
+    rejected puzzles do not count towards ``count``.
+
+    :param shape: "square" or "hexagon"
+    :param size: (width, height) of a rectangle or the side of a hexagon
+    :param count: how many puzzles to yield, without end when left out
+    :param seed: the base seed of the stream, a fresh one when left out
+    :param workers: the number of processes, defaults to the number of CPUs
+        when None, while 1 makes every puzzle in this process only when it
+        is asked for
+    :param prefetch: how many puzzles the workers may run ahead of the
+        consumer, twice the number of workers by default
+    :param min_coverage: the smallest share of cells inside the loop
+    :param max_coverage: the largest share of cells inside the loop
+    :param minimised: remove clues while every puzzle stays unique
+    :param accept: a further filter, which runs in this process
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape {shape!r}")
+    topology = SHAPES[shape].topology(size)
+    seeds = seed_stream(seed)
+    jobs = ((shape, size, s, minimised, min_coverage, max_coverage) for s in seeds)
+
+    def finish(job, result) -> Puzzle | None:
+        if result is None:
+            return None
+        loop, clues = result
+        puzzle = Puzzle(
+            shape,
+            size,
+            job[2],
+            topology,
+            np.frombuffer(loop, dtype=np.uint8),
+            np.frombuffer(clues, dtype=np.int8),
+        )
+        if accept is not None and not accept(puzzle):
+            return None
+        return puzzle
+
+    yielded = 0
+    if workers == 1:
+        for job in jobs:
+            if count is not None and yielded >= count:
+                return
+            puzzle = finish(job, make_puzzle(job))
+            if puzzle is not None:
+                yielded += 1
+                yield puzzle
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        ahead = prefetch or 2 * (workers or os.cpu_count() or 1)
+        pending: deque = deque()
+        while count is None or yielded < count:
+            # Only as many jobs as the consumer may need are in flight
+            while len(pending) < ahead:
+                job = next(jobs)
+                pending.append((job, pool.apply_async(make_puzzle, (job,))))
+            job, result = pending.popleft()
+            puzzle = finish(job, result.get())
+            if puzzle is not None:
+                yielded += 1
+                yield puzzle
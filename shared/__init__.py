@@ -1,5 +1,6 @@
 from .enums import EdgeStatus, LoopStatus, ConstraintStatus
 from .slitherlink import Cell, Edge, Junction
+from .board import Board, Incidence, Topology
 
 __all__ = [
     "EdgeStatus",
@@ -8,4 +9,7 @@ __all__ = [
     "Cell",
     "Edge",
     "Junction",
+    "Board",
+    "Incidence",
+    "Topology",
 ]
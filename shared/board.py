@@ -0,0 +1,407 @@
+from __future__ import annotations
+from array import array
+from typing import Iterable
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse.csgraph import connected_components  # type: ignore
+
+from shared.enums import ConstraintStatus, EdgeStatus, LoopStatus
+from shared.slitherlink import Cell, Edge, Junction
+
+NO_CONSTRAINT = -1
+
+
+class Incidence:
+    """A CSR-style incidence list between two kinds of elements.
+
+    Row ``i`` holds the ids ``indices[offsets[i]:offsets[i + 1]]``. Both
+    arrays are plain ``array.array``, so reading them from Python returns
+    ints, and :meth:`numpy` gives zero-copy NumPy views for vectorized code.
+    """
+
+    __slots__ = ("offsets", "indices")
+
+    offsets: array
+    indices: array
+
+    def __init__(self, offsets: array, indices: array):
+        self.offsets = offsets
+        self.indices = indices
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int]]) -> Incidence:
+        offsets = array("i", [0])
+        indices = array("i")
+        for row in rows:
+            indices.extend(row)
+            offsets.append(len(indices))
+        return cls(offsets, indices)
+
+    @classmethod
+    def from_numpy(cls, offsets: np.ndarray, indices: np.ndarray) -> Incidence:
+        return cls(to_array(offsets), to_array(indices))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def row(self, i: int) -> array:
+        return self.indices[self.offsets[i] : self.offsets[i + 1]]
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def numpy(self) -> tuple[np.ndarray, np.ndarray]:
+        """Read-only views of ``offsets`` and ``indices``. A topology is
+        shared by every board of its shape and size, so it must not be
+        changed through them."""
+        offsets = np.frombuffer(self.offsets, dtype=np.int32)
+        indices = np.frombuffer(self.indices, dtype=np.int32)
+        offsets.flags.writeable = False
+        indices.flags.writeable = False
+        return offsets, indices
+
+    def rows(self) -> np.ndarray:
+        """The row id of every entry in ``indices``."""
+        offsets, _ = self.numpy()
+        return np.repeat(np.arange(len(self), dtype=np.int32), np.diff(offsets))
+
+    def transpose(self, num_cols: int) -> Incidence:
+        """Invert the incidence, e.g. turn cell→edges into edge→cells.
+
+        The rows of the result list their ids in ascending order.
+        """
+        _, indices = self.numpy()
+        order = np.argsort(indices, kind="stable")
+        counts = np.bincount(indices, minlength=num_cols)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return Incidence.from_numpy(offsets, self.rows()[order])
+
+    def compose(self, other: Incidence, exclude_self: bool = False) -> Incidence:
+        """Follow this incidence and then ``other``, e.g. cell→edges and
+        edge→junctions give cell→junctions.
+
+        Every id is listed once per row, in the order it is first reached.
+
+        :param other: the incidence to follow from the ids of this one
+        :param exclude_self: drop the row's own id, e.g. for cell→cells
+        """
+        _, indices = self.numpy()
+        other_offsets, other_indices = other.numpy()
+        starts = other_offsets[indices]
+        counts = other_offsets[indices + 1] - starts
+        rows = np.repeat(self.rows(), counts)
+        ramp = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cols = other_indices[np.repeat(starts, counts) + ramp]
+
+        keep = np.ones(len(cols), dtype=bool) if not exclude_self else rows != cols
+        keys = rows[keep].astype(np.int64) * (len(other) + 1) + cols[keep]
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        rows, cols = rows[keep][first], cols[keep][first]
+
+        offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(rows, minlength=len(self))))
+        )
+        return Incidence.from_numpy(offsets, cols)
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.offsets) + len(self.indices)) * self.indices.itemsize
+
+
+class Topology:
+    """The incidence of a board of one shape and size.
+
+    It holds no state, so one topology is shared by every board of its
+    shape and size, and its tables must not be changed once it is built.
+    """
+
+    num_cells: int
+    num_edges: int
+    num_junctions: int
+
+    cell_edges: Incidence
+    junction_edges: Incidence
+    edge_cells: Incidence
+    edge_junctions: Incidence
+    cell_neighbours: Incidence
+    cell_junctions: Incidence
+    junction_cells: Incidence
+
+    def __init__(
+        self, num_edges: int, cell_edges: Incidence, junction_edges: Incidence
+    ):
+        """Build the full incidence of a board from the edges of its cells
+        and junctions. Every step is linear in the size of the board.
+
+        :param num_edges: the number of edges of the board
+        :param cell_edges: the edges of every cell, in clockwise order
+        :param junction_edges: the edges of every junction
+        """
+        self.num_cells = len(cell_edges)
+        self.num_edges = num_edges
+        self.num_junctions = len(junction_edges)
+
+        self.cell_edges = cell_edges
+        self.junction_edges = junction_edges
+        self.edge_cells = cell_edges.transpose(num_edges)
+        self.edge_junctions = junction_edges.transpose(num_edges)
+        self.cell_neighbours = cell_edges.compose(self.edge_cells, exclude_self=True)
+        self.cell_junctions = cell_edges.compose(self.edge_junctions)
+        self.junction_cells = junction_edges.compose(self.edge_cells)
+
+        self._opposites: Incidence | None = None
+
+    @property
+    def opposites(self) -> Incidence:
+        """The cells on the far side of every neighbour of every cell.
+
+        Row ``k`` belongs to entry ``k`` of ``cell_neighbours.indices``, the
+        neighbour ``n`` of a cell ``c``. It holds the cells that share a
+        junction with ``n`` but not with ``c``, which is what
+        :meth:`Cell.get_cells_opposite_side` returns. Only the generator
+        needs it, so it is built the first time it is asked for and then
+        kept with the rest of the topology.
+        """
+        if self._opposites is None:
+            around = self.cell_junctions.compose(self.junction_cells)
+            pairs = self.cell_neighbours.rows()
+            _, neighbours = self.cell_neighbours.numpy()
+            offsets, indices = around.numpy()
+
+            # The cells around every neighbour, tagged with their pair
+            counts = offsets[neighbours + 1] - offsets[neighbours]
+            starts = np.repeat(offsets[neighbours], counts)
+            ramp = np.arange(counts.sum()) - np.repeat(
+                np.cumsum(counts) - counts, counts
+            )
+            rows = np.repeat(np.arange(len(pairs)), counts)
+            cols = indices[starts + ramp]
+
+            # minus the cells around the cell itself, padded into a matrix
+            # since every cell only has a handful of them
+            sizes = np.diff(offsets)
+            near = np.full((len(around), sizes.max()), -1, dtype=np.int32)
+            near[
+                around.rows(), np.arange(len(indices)) - offsets[:-1].repeat(sizes)
+            ] = indices
+            keep = ~(near[pairs[rows]] == cols[:, None]).any(axis=1)
+            rows, cols = rows[keep], cols[keep]
+            self._opposites = Incidence.from_numpy(
+                np.concatenate(
+                    ([0], np.cumsum(np.bincount(rows, minlength=len(pairs))))
+                ),
+                cols,
+            )
+        return self._opposites
+
+    @property
+    def nbytes(self) -> int:
+        """The memory held by the incidence tables."""
+        tables = [
+            self.cell_edges,
+            self.junction_edges,
+            self.edge_cells,
+            self.edge_junctions,
+            self.cell_neighbours,
+            self.cell_junctions,
+            self.junction_cells,
+        ]
+        if self._opposites is not None:
+            tables.append(self._opposites)
+        return sum(t.nbytes for t in tables)
+
+
+class Board:
+    """A packed slitherlink board.
+
+    Cells, edges and junctions are integer ids. Their incidence is held in
+    a shared :class:`Topology` and their state in byte arrays of the board
+    itself, while :class:`Cell`, :class:`Edge` and :class:`Junction` are
+    thin views over this board. Views are created once per board the first
+    time a list of them is asked for, so they can be compared by identity
+    and used as keys.
+    """
+
+    topology: Topology
+    num_cells: int
+    num_edges: int
+    num_junctions: int
+
+    cell_edges: Incidence
+    junction_edges: Incidence
+    edge_cells: Incidence
+    edge_junctions: Incidence
+    cell_neighbours: Incidence
+    cell_junctions: Incidence
+    junction_cells: Incidence
+
+    edge_status: bytearray
+    constraints: array
+    cell_status: bytearray
+    loop_status: bytearray
+
+    def __init__(self, topology: Topology):
+        """Lay fresh state over a topology, which takes time linear in the
+        number of elements but builds no incidence.
+
+        :param topology: the incidence of the board, which is only read
+        """
+        self.topology = topology
+        self.num_cells = topology.num_cells
+        self.num_edges = topology.num_edges
+        self.num_junctions = topology.num_junctions
+
+        self.cell_edges = topology.cell_edges
+        self.junction_edges = topology.junction_edges
+        self.edge_cells = topology.edge_cells
+        self.edge_junctions = topology.edge_junctions
+        self.cell_neighbours = topology.cell_neighbours
+        self.cell_junctions = topology.cell_junctions
+        self.junction_cells = topology.junction_cells
+
+        self.edge_status = bytearray([EdgeStatus.EMPTY.value]) * self.num_edges
+        self.constraints = array("b", [NO_CONSTRAINT]) * self.num_cells
+        self.cell_status = bytearray(self.num_cells)
+        self.loop_status = bytearray([LoopStatus.UNKNOWN.value]) * self.num_cells
+
+        self._cells: list[Cell] | None = None
+        self._edges: list[Edge] | None = None
+        self._junctions: list[Junction] | None = None
+
+    @property
+    def cells(self) -> list[Cell]:
+        if self._cells is None:
+            self._cells = [Cell(self, i) for i in range(self.num_cells)]
+        return self._cells
+
+    @property
+    def edges(self) -> list[Edge]:
+        if self._edges is None:
+            self._edges = [Edge(self, i) for i in range(self.num_edges)]
+        return self._edges
+
+    @property
+    def junctions(self) -> list[Junction]:
+        if self._junctions is None:
+            self._junctions = [Junction(self, i) for i in range(self.num_junctions)]
+        return self._junctions
+
+    def compute_constraints(self, loop_status: bytes | np.ndarray) -> np.ndarray:
+        """The number of every cell for a finished loop, vectorized.
+
+        Every edge between two cells on different sides of the loop counts
+        for both cells, and every border edge counts for its cell unless the
+        cell is outside, which is what :meth:`Cell.set_contraint` computes
+        one cell at a time.
+
+        :param loop_status: the :class:`LoopStatus` value of every cell
+        :return: the numbers, as int8
+        """
+        status = np.frombuffer(loop_status, dtype=np.uint8)
+        offsets, cells = self.edge_cells.numpy()
+        degree = np.diff(offsets)
+        first = cells[offsets[:-1]]
+        inner = degree == 2
+        a, b = first[inner], cells[offsets[:-1][inner] + 1]
+        border = first[~inner]
+
+        differ = status[a] != status[b]
+        counts = np.bincount(a[differ], minlength=self.num_cells)
+        counts += np.bincount(b[differ], minlength=self.num_cells)
+        counts += np.bincount(
+            border[status[border] != LoopStatus.OUT.value], minlength=self.num_cells
+        )
+        return counts.astype(np.int8)
+
+    def solution_edges(self, loop_status: bytes | None = None) -> np.ndarray:
+        """Whether every edge is part of the loop, vectorized
+        :meth:`Edge.should_be_selected`.
+
+        :param loop_status: the :class:`LoopStatus` value of every cell, the
+            loop status of the board when left out
+        """
+        status = np.frombuffer(
+            self.loop_status if loop_status is None else loop_status, dtype=np.uint8
+        )
+        offsets, cells = self.edge_cells.numpy()
+        first, last = status[cells[offsets[:-1]]], status[cells[offsets[1:] - 1]]
+        inner = np.diff(offsets) == 2
+        return np.where(inner, first != last, first == LoopStatus.NOEXP.value)
+
+    def loop_from_solution(self, solution: np.ndarray) -> np.ndarray:
+        """The :class:`LoopStatus` value of every cell for a loop given by its
+        edges, the inverse of :meth:`solution_edges`.
+
+        Cells that reach the border without crossing the loop are OUT and
+        all others NOEXP, as they are after :meth:`Generator.gen_loop`.
+        """
+        offsets, cells = self.edge_cells.numpy()
+        inner = np.diff(offsets) == 2
+        first = cells[offsets[:-1]]
+        # Border edges lead to one extra node for the outside of the board
+        second = np.where(inner, cells[offsets[1:] - 1], self.num_cells)
+        crossable = ~np.asarray(solution, dtype=bool)
+        nodes = self.num_cells + 1
+        graph = sparse.coo_matrix(
+            (
+                np.ones(np.count_nonzero(crossable), dtype=np.int8),
+                (first[crossable], second[crossable]),
+            ),
+            shape=(nodes, nodes),
+        )
+        _, labels = connected_components(graph, directed=False)
+        outside = labels[:-1] == labels[-1]
+        return np.where(outside, LoopStatus.OUT.value, LoopStatus.NOEXP.value).astype(
+            np.uint8
+        )
+
+    def selected_counts(self, incidence: Incidence, num_rows: int) -> np.ndarray:
+        """The number of selected edges of every row of an edge incidence.
+
+        :param incidence: an edge→X incidence, e.g. ``edge_cells``
+        :param num_rows: the number of X
+        """
+        selected = np.frombuffer(self.edge_status, dtype=np.uint8)
+        selected = selected == EdgeStatus.SELECTED.value
+        _, indices = incidence.numpy()
+        return np.bincount(indices[selected[incidence.rows()]], minlength=num_rows)
+
+    def update_cell_status(self) -> None:
+        """Compare every cell with its number, vectorized :meth:`Cell.update`."""
+        constraints = np.frombuffer(self.constraints, dtype=np.int8)
+        counts = self.selected_counts(self.edge_cells, self.num_cells)
+        sign = np.sign(counts - constraints)
+        status = np.choose(
+            sign + 1,
+            [
+                ConstraintStatus.LESS.value,
+                ConstraintStatus.EXACT.value,
+                ConstraintStatus.MORE.value,
+            ],
+        )
+        status[constraints < 0] = 0
+        self.cell_status[:] = status.astype(np.uint8).tobytes()
+
+    @property
+    def opposites(self) -> Incidence:
+        """The cells on the far side of every neighbour of every cell, see
+        :attr:`Topology.opposites`."""
+        return self.topology.opposites
+
+    @property
+    def nbytes(self) -> int:
+        """The memory held by the packed arrays, without any views."""
+        return (
+            self.topology.nbytes
+            + len(self.edge_status)
+            + len(self.constraints)
+            + len(self.cell_status)
+            + len(self.loop_status)
+        )
+
+
+def to_array(values: np.ndarray) -> array:
+    res = array("i")
+    res.frombytes(np.ascontiguousarray(values, dtype=np.int32).tobytes())
+    return res
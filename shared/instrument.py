@@ -0,0 +1,201 @@
+"""Timing spans and counters for the generator and the game.
+
+Phases are timed with :func:`span` and events are counted with
+:func:`count`, both of which go to the sink of the process, if there is one.
+Without a sink a span is a shared no-op context manager and a count a
+single check, and the counters of the hot loop of
+:meth:`Generator.gen_loop` are only wired in while a sink listens, so
+instrumentation costs next to nothing when it is off.
+
+    recorder = MemorySink()
+    with instrument.use(recorder):
+        Game.generate_random_shape("hexagon", size1=20)
+    recorder.summary()
+
+The spans are ``topology``, ``setup``, ``gen_loop``, ``populate_numbers``
+and ``minimise``, the counters are prefixed with the span they belong to.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterable, Iterator
+import cProfile
+import json
+import pstats
+import sys
+import time
+
+
+class Sink:
+    """Receives spans and counts. Every method does nothing by default."""
+
+    def start(self, name: str) -> None:
+        """A span is about to start."""
+
+    def span(self, name: str, seconds: float, fields: dict[str, Any]) -> None:
+        """A span has ended.
+
+        :param fields: the values the span was started with, and any added
+            by the code inside it
+        """
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    seconds: float
+    fields: dict[str, Any]
+
+
+@dataclass
+class MemorySink(Sink):
+    """Keeps every span and the total of every counter in memory."""
+
+    spans: list[SpanRecord] = field(default_factory=list)
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def span(self, name: str, seconds: float, fields: dict[str, Any]) -> None:
+        self.spans.append(SpanRecord(name, seconds, fields))
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """The number of spans of every name and their total, mean and
+        longest time in seconds."""
+        res: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            stats = res.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += span.seconds
+            stats["max"] = max(stats["max"], span.seconds)
+        for stats in res.values():
+            stats["mean"] = stats["total"] / stats["count"]
+        return res
+
+
+class JsonLinesSink(Sink):
+    """Writes every span and count as a JSON object on its own line."""
+
+    def __init__(self, output: IO[str]):
+        self.output = output
+
+    def span(self, name: str, seconds: float, fields: dict[str, Any]) -> None:
+        event = {"event": "span", "name": name, "seconds": seconds, **fields}
+        self.output.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def count(self, name: str, value: int) -> None:
+        event = {"event": "count", "name": name, "value": value}
+        self.output.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+class PrintSink(Sink):
+    """Prints how long every span took, for a person watching."""
+
+    def __init__(self, output: IO[str] | None = None):
+        self.output = output
+
+    def span(self, name: str, seconds: float, fields: dict[str, Any]) -> None:
+        print(f"{name} took {round(seconds, 3)}s", file=self.output or sys.stdout)
+
+
+class ProfileSink(Sink):
+    """Runs cProfile while a span is open and hands everything on to another
+    sink. Nested spans are profiled once, from the outermost one.
+
+    :param sink: the sink that receives the spans and counts as well
+    :param names: the spans to profile, all of them when left out
+    """
+
+    def __init__(self, sink: Sink | None = None, names: Iterable[str] | None = None):
+        self.sink = sink or Sink()
+        self.names = None if names is None else set(names)
+        self.profile = cProfile.Profile()
+        self.depth = 0
+
+    def start(self, name: str) -> None:
+        if self.names is None or name in self.names:
+            if self.depth == 0:
+                self.profile.enable()
+            self.depth += 1
+        self.sink.start(name)
+
+    def span(self, name: str, seconds: float, fields: dict[str, Any]) -> None:
+        if self.names is None or name in self.names:
+            self.depth -= 1
+            if self.depth == 0:
+                self.profile.disable()
+        self.sink.span(name, seconds, fields)
+
+    def count(self, name: str, value: int) -> None:
+        self.sink.count(name, value)
+
+    def stats(self) -> pstats.Stats:
+        return pstats.Stats(self.profile)
+
+
+class Span:
+    __slots__ = ("sink", "name", "fields", "started")
+
+    def __init__(self, sink: Sink, name: str, fields: dict[str, Any]):
+        self.sink = sink
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self) -> dict[str, Any]:
+        self.sink.start(self.name)
+        self.started = time.perf_counter()
+        return self.fields
+
+    def __exit__(self, *exc) -> None:
+        seconds = time.perf_counter() - self.started
+        self.sink.span(self.name, seconds, self.fields)
+
+
+NO_SPAN = nullcontext()
+
+_sink: Sink | None = None
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+def set_sink(sink: Sink | None) -> Sink | None:
+    """Send everything to a sink from now on, or nowhere for None.
+
+    :return: the sink that was set before
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+@contextmanager
+def use(sink: Sink) -> Iterator[Sink]:
+    """Send everything to a sink while the block runs."""
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+def span(name: str, **fields: Any) -> Span | nullcontext:
+    """Time a block of code.
+
+    The block gets the fields of the span to add to, or None when nothing
+    listens, which also tells it to skip any counting of its own.
+    """
+    if _sink is None:
+        return NO_SPAN
+    return Span(_sink, name, fields)
+
+
+def count(name: str, value: int = 1) -> None:
+    if _sink is not None:
+        _sink.count(name, value)
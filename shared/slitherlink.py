@@ -1,27 +1,49 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
 
 from shared.enums import EdgeStatus, ConstraintStatus, LoopStatus
 
+if TYPE_CHECKING:
+    from shared.board import Board
+
+EDGE_STATUS = {s.value: s for s in EdgeStatus}
+CONSTRAINT_STATUS = {s.value: s for s in ConstraintStatus}
+LOOP_STATUS = {s.value: s for s in LoopStatus}
+
 
 class Edge:
+    """A view of one edge of a :class:`Board`."""
+
+    __slots__ = ("board", "ident")
+
+    board: Board
     ident: int
-    status: EdgeStatus
-    cells: set[Cell]
-    junctions: set[Junction]
 
-    def __init__(self, ident):
+    def __init__(self, board: Board, ident: int):
+        self.board = board
         self.ident = ident
-        self.status = EdgeStatus.EMPTY
-        self.cells = set()
-        self.junctions = set()
-
-    def setup_variables(self, cells, junctions):
-        for cell in cells:
-            if self in cell.edges:
-                self.cells.add(cell)
-        for junction in junctions:
-            if self in junction.edges:
-                self.junctions.add(junction)
+
+    def __repr__(self) -> str:
+        return f"Edge({self.ident})"
+
+    @property
+    def status(self) -> EdgeStatus:
+        return EDGE_STATUS[self.board.edge_status[self.ident]]
+
+    @status.setter
+    def status(self, status: EdgeStatus) -> None:
+        self.board.edge_status[self.ident] = status.value
+
+    @property
+    def cells(self) -> tuple[Cell, ...]:
+        board = self.board
+        return tuple(map(board.cells.__getitem__, board.edge_cells.row(self.ident)))
+
+    @property
+    def junctions(self) -> tuple[Junction, ...]:
+        board = self.board
+        row = board.edge_junctions.row(self.ident)
+        return tuple(map(board.junctions.__getitem__, row))
 
     def update(self):
         self.iterate_status()
@@ -30,7 +52,7 @@ class Edge:
         self.status = EdgeStatus((2 * self.status.value) % 7)
 
     def is_selected(self):
-        return self.status == EdgeStatus.SELECTED
+        return self.board.edge_status[self.ident] == EdgeStatus.SELECTED.value
 
     def should_be_selected(self):
         arr = [c.loop_status for c in self.cells]
@@ -43,57 +65,96 @@ class Edge:
 
     @staticmethod
     def are_neighbours(e1: Edge, e2: Edge) -> bool:
-        for j in e1.junctions:
-            if j in e2.junctions:
+        junctions = e1.board.edge_junctions
+        others = junctions.row(e2.ident)
+        for j in junctions.row(e1.ident):
+            if j in others:
                 return True
         return False
 
     @staticmethod
-    def num_selected_edges(arr: list[Edge]) -> int:
-        return sum([1 for e in arr if e.status == EdgeStatus.SELECTED])
+    def num_selected_edges(arr) -> int:
+        return sum([1 for e in arr if e.is_selected()])
 
 
 class Cell:
+    """A view of one cell of a :class:`Board`."""
+
+    __slots__ = ("board", "ident")
+
+    board: Board
     ident: int
-    neighbours: set[Cell]
-    junctions: set[Junction]
-    edges: set[Edge]
-    sides: int
-    constraint: int | None
-    status: ConstraintStatus | None
-    loop_status: LoopStatus
-
-    def __init__(self, edges, ident, sides):
+
+    def __init__(self, board: Board, ident: int):
+        self.board = board
         self.ident = ident
-        self.neighbours = set()
-        self.junctions = set()
-        self.edges = edges
-        self.sides = sides
-        self.constraint = None
-        self.loop_status = LoopStatus.UNKNOWN
-
-    def setup_variables(self):
-        for edge in self.edges:
-            for cell in edge.cells:
-                if cell is self:
-                    continue
-                self.neighbours.add(cell)
-                break
 
-            for junction in edge.junctions:
-                self.junctions.add(junction)
+    def __repr__(self) -> str:
+        return f"Cell({self.ident})"
+
+    @property
+    def edges(self) -> tuple[Edge, ...]:
+        board = self.board
+        return tuple(map(board.edges.__getitem__, board.cell_edges.row(self.ident)))
+
+    @property
+    def neighbours(self) -> tuple[Cell, ...]:
+        board = self.board
+        row = board.cell_neighbours.row(self.ident)
+        return tuple(map(board.cells.__getitem__, row))
+
+    @property
+    def junctions(self) -> tuple[Junction, ...]:
+        board = self.board
+        row = board.cell_junctions.row(self.ident)
+        return tuple(map(board.junctions.__getitem__, row))
+
+    @property
+    def sides(self) -> int:
+        return self.board.cell_edges.degree(self.ident)
+
+    @property
+    def constraint(self) -> int | None:
+        constraint = self.board.constraints[self.ident]
+        return None if constraint < 0 else constraint
+
+    @constraint.setter
+    def constraint(self, constraint: int | None) -> None:
+        self.board.constraints[self.ident] = -1 if constraint is None else constraint
+
+    @property
+    def status(self) -> ConstraintStatus | None:
+        return CONSTRAINT_STATUS.get(self.board.cell_status[self.ident])
+
+    @status.setter
+    def status(self, status: ConstraintStatus | None) -> None:
+        self.board.cell_status[self.ident] = 0 if status is None else status.value
+
+    @property
+    def loop_status(self) -> LoopStatus:
+        return LOOP_STATUS[self.board.loop_status[self.ident]]
+
+    @loop_status.setter
+    def loop_status(self, status: LoopStatus) -> None:
+        self.board.loop_status[self.ident] = status.value
 
     def num_selected_edges_at_cell(self) -> int:
-        return sum([1 for e in self.edges if e.is_selected()])
+        board = self.board
+        status = board.edge_status
+        selected = EdgeStatus.SELECTED.value
+        return sum(
+            [1 for e in board.cell_edges.row(self.ident) if status[e] == selected]
+        )
 
     def set_contraint(self) -> None:
         if self.loop_status == LoopStatus.OUT:
-            self.constraint = 0
+            constraint = 0
         else:
-            self.constraint = len(self.edges) - len(self.neighbours)
+            constraint = self.sides - len(self.board.cell_neighbours.row(self.ident))
         for cell in self.neighbours:
             if cell.loop_status != self.loop_status:
-                self.constraint += 1
+                constraint += 1
+        self.constraint = constraint
 
     def is_constraint(self) -> ConstraintStatus | None:
         if self.constraint is None:
@@ -113,15 +174,19 @@ class Cell:
         self.status = self.is_constraint()
 
     def get_cells_opposite_side(self, cell: Cell) -> list[Cell]:
-        res = set(flatten([j.cells for j in cell.junctions]))
-        res = res - set(flatten([j.cells for j in self.junctions]))
-        return list(res)
+        board = self.board
+        row = board.junction_cells.row
+        res = set()
+        for j in board.cell_junctions.row(cell.ident):
+            res.update(row(j))
+        for j in board.cell_junctions.row(self.ident):
+            res.difference_update(row(j))
+        return list(map(board.cells.__getitem__, res))
 
     def junction_intersection(self, cell: Cell) -> list[Cell]:
         res = []
         for j in list(set(self.junctions) & set(cell.junctions)):
-            j.get_surrounding_cells()
-            for c in j.cells:
+            for c in j.get_surrounding_cells():
                 if c is self or c is cell:
                     continue
                 if c not in res:
@@ -130,43 +195,47 @@ class Cell:
         return res
 
     def get_neighbours(self) -> list[Cell]:
-        res = []
-        for edge in self.edges:
-            res.extend(edge.cells - {self})
-            # for cell in cells:
-            #     if cell is self:
-            #         continue
-            #     if edge in cell.edges:
-            #         res.append(cell)
-        return res
+        return list(self.neighbours)
 
     def print_edge(self):
         print(self.edges)
 
 
 class Junction:
-    edges: set[Edge]
-    cells: set[Cell]
+    """A view of one junction of a :class:`Board`."""
+
+    __slots__ = ("board", "ident")
+
+    board: Board
     ident: int
 
-    def __init__(self, edges, ident):
-        self.edges = edges
+    def __init__(self, board: Board, ident: int):
+        self.board = board
         self.ident = ident
-        self.cells = set()
 
-    def setup_variables(self):
-        for edge in self.edges:
-            for cell in edge.cells:
-                if cell not in self.cells:
-                    self.cells.add(cell)
+    def __repr__(self) -> str:
+        return f"Junction({self.ident})"
+
+    @property
+    def edges(self) -> tuple[Edge, ...]:
+        board = self.board
+        row = board.junction_edges.row(self.ident)
+        return tuple(map(board.edges.__getitem__, row))
+
+    @property
+    def cells(self) -> tuple[Cell, ...]:
+        board = self.board
+        row = board.junction_cells.row(self.ident)
+        return tuple(map(board.cells.__getitem__, row))
 
     def get_surrounding_cells(self) -> list[Cell]:
         """Get the surrounding cells in traversable order.
 
         :return: A list of cells that surround the junction, in order.
         """
-        res = self.cells[:1]
-        temp = self.cells[1:]
+        cells = self.cells
+        res = list(cells[:1])
+        temp = list(cells[1:])
         i = 0
         while len(temp) > 0:
             if res[-1] in temp[i].neighbours:
@@ -183,7 +252,11 @@ class Junction:
         return shift_and_remove(cells, cell)
 
     def is_valid(self) -> bool:
-        return Edge.num_selected_edges(self.edges) in [0, 2]
+        board = self.board
+        status = board.edge_status
+        selected = EdgeStatus.SELECTED.value
+        row = board.junction_edges.row(self.ident)
+        return sum([1 for e in row if status[e] == selected]) in [0, 2]
 
     def update(self):
         pass
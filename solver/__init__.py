@@ -0,0 +1,16 @@
+from .solver import Solver, SolveResult, Contradiction
+from .minimiser import Minimiser, MinimiseResult, minimise
+from .validator import Validator, Validation, pack, selection
+
+__all__ = [
+    "Solver",
+    "SolveResult",
+    "Contradiction",
+    "Minimiser",
+    "MinimiseResult",
+    "minimise",
+    "Validator",
+    "Validation",
+    "pack",
+    "selection",
+]
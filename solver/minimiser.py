@@ -0,0 +1,178 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+import random
+import time
+
+from shared.board import Board, NO_CONSTRAINT
+from solver.solver import UNKNOWN, Contradiction, Solver
+
+
+@dataclass
+class MinimiseResult:
+    """The outcome of a minimisation.
+
+    ``unique`` is False when the puzzle could not be shown to have a unique
+    solution to begin with, in which case no clue is removed. ``undecided``
+    counts the checks that ran out of their budget, which keep their clues.
+    """
+
+    unique: bool
+    removed: int
+    remaining: int
+    checks: int
+    undecided: int
+    seconds: float
+
+
+class Minimiser:
+    """Removes clues from a numbered board while its solution stays unique.
+
+    The puzzle is checked to be unique once. After that, removing a batch of
+    clues keeps it unique exactly when every solution without them still
+    gives each of their cells its old clue, because any other solution would
+    also solve the puzzle before the removal. So the solver propagates the
+    puzzle without the batch once, and every other value of every removed
+    clue is tried on top of that through the trail. Most of them end in a
+    contradiction right away, the rest probe the edges around the cell and
+    then run a small search. A clue is kept when that search finds another
+    solution or runs out of its budget, so the result is always unique but
+    only as sparse as the solver is strong.
+
+    A batch keeps the clues that failed, and those are tried again with a
+    smaller batch until they fail on their own. The batch size doubles after
+    every batch that goes as a whole and halves otherwise.
+    """
+
+    board: Board
+    solver: Solver
+
+    def __init__(
+        self,
+        board: Board,
+        seed: int | None = None,
+        batch_size: int = 8,
+        node_limit: int | None = 20,
+        probe: bool = False,
+    ):
+        """
+        :param board: the numbered board, whose clues are removed in place
+        :param seed: the seed of the order the clues are tried in
+        :param batch_size: the size of the first batch
+        :param node_limit: the search budget of one check, a clue whose check
+            runs out of it is kept
+        :param probe: whether to :meth:`Solver.probe` the puzzle without the
+            batch before its checks, which settles more of them without a
+            search
+        """
+        self.board = board
+        self.solver = Solver(board)
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.node_limit = node_limit
+        self.probe = probe
+        self.checks = 0
+        self.undecided = 0
+
+    def minimise(self) -> MinimiseResult:
+        start = time.perf_counter()
+        clues = self.solver.clues
+        order = [c for c, clue in enumerate(clues) if clue >= 0]
+        removed = 0
+
+        self.checks += 1
+        unique = self.solver.count_solutions(2, self.node_limit) == 1
+        if unique:
+            self.random.shuffle(order)
+            pending = deque(order)
+            size = self.batch_size
+            while pending:
+                batch = [pending.popleft() for _ in range(min(size, len(pending)))]
+                kept = self.try_remove(batch)
+                removed += len(batch) - len(kept)
+                if not kept:
+                    size *= 2
+                    continue
+                size = max(1, size // 2)
+                if len(batch) > 1:
+                    pending.extendleft(reversed(kept))
+
+        for c, clue in enumerate(clues):
+            if clue < 0 and self.board.constraints[c] >= 0:
+                self.board.constraints[c] = NO_CONSTRAINT
+                self.board.cell_status[c] = 0
+        return MinimiseResult(
+            unique,
+            removed,
+            len(order) - removed,
+            self.checks,
+            self.undecided,
+            time.perf_counter() - start,
+        )
+
+    def try_remove(self, batch: list[int]) -> list[int]:
+        """Remove the clues of a batch, except those that have to stay while
+        the rest of the batch is removed.
+
+        :return: the cells whose clues were kept
+        """
+        solver = self.solver
+        clues = {c: solver.clues[c] for c in batch}
+        for c in batch:
+            solver.set_clue(c, None)
+        solver.restart()
+        solver.solve()
+        if self.probe:
+            solver.probe()
+
+        if UNKNOWN in solver.state:
+            kept = [c for c in batch if not self.is_forced(c, clues[c])]
+        else:
+            kept = []
+        solver.restart()
+        for c in kept:
+            solver.set_clue(c, clues[c])
+        return kept
+
+    def nearby_edges(self, c: int) -> list[int]:
+        """The edges of a cell and of the cells around it, which is where a
+        wrong clue usually shows."""
+        solver = self.solver
+        cells = dict.fromkeys(
+            n for e in solver.cell_edges[c] for n in solver.edge_cells[e]
+        )
+        return list(dict.fromkeys(e for n in cells for e in solver.cell_edges[n]))
+
+    def is_forced(self, c: int, clue: int) -> bool:
+        """Whether every other clue of a cell has no solution, on top of what
+        the solver has deduced without it."""
+        solver = self.solver
+        mark = len(solver.trail)
+        for other in range(len(solver.cell_edges[c]) + 1):
+            if other == clue:
+                continue
+            self.checks += 1
+            solver.set_clue(c, other)
+            try:
+                solver.propagate()
+                solver.probe(self.nearby_edges(c))
+                result = solver.search(1, self.node_limit, probe=False)
+                status = result.status
+            except Contradiction:
+                status = "contradiction"
+            solver.undo(mark)
+            solver.set_clue(c, None)
+            if status != "contradiction":
+                self.undecided += status == "budget"
+                return False
+        return True
+
+
+def minimise(board: Board, seed: int | None = None, **kwargs) -> MinimiseResult:
+    """Remove clues from a numbered board while its solution stays unique.
+
+    :param board: the numbered board, whose clues are removed in place
+    :param seed: the seed of the order the clues are tried in
+    :param kwargs: the batch size, budget and probing of :class:`Minimiser`
+    """
+    return Minimiser(board, seed, **kwargs).minimise()
@@ -0,0 +1,646 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Sequence
+import time
+
+from shared.board import Board
+from shared.enums import EdgeStatus
+
+UNKNOWN = EdgeStatus.EMPTY.value
+ON = EdgeStatus.SELECTED.value
+OFF = EdgeStatus.MARKED.value
+
+CELL = 0
+JUNCTION = 1
+
+
+class Contradiction(Exception):
+    """Raised when the known edges can not be part of any solution."""
+
+
+@dataclass
+class SolveResult:
+    """The outcome of a solve.
+
+    ``status`` is "solved" when every edge is known and forms a single loop,
+    "stalled" when the rules can not deduce anything more, "contradiction"
+    when the clues have no solution and "budget" when a search ran out of
+    nodes or time. ``rules`` maps every rule to the number of edges it fixed
+    and the number of cells it completed. ``nodes`` and ``solutions`` are
+    only counted by :meth:`Solver.search`.
+    """
+
+    status: str
+    seconds: float
+    rules: dict[str, dict[str, int]] = field(default_factory=dict)
+    nodes: int = 0
+    solutions: int = 0
+
+    @property
+    def solved(self) -> bool:
+        return self.status == "solved"
+
+
+class Solver:
+    """A queue-driven constraint propagation solver.
+
+    The solver keeps its own state for every edge, UNKNOWN, ON or OFF, using
+    the values of :class:`EdgeStatus` (EMPTY, SELECTED and MARKED), plus running
+    counts of ON and UNKNOWN edges around every cell and junction. Setting an
+    edge only queues the cells and junctions around it, so every rule is only
+    re-checked where something changed.
+
+    Every set edge is pushed on a trail, so a search can undo its guesses
+    without copying the board. The ON edges are also joined in a union-find
+    over the junctions, without path compression so that joins can be undone
+    too, which rejects a closed loop as soon as it leaves other ON edges out.
+    A second union-find colours the cells, plus the outside of the board, by
+    their side of the loop, which rejects guesses that can not be split into
+    an inside and an outside.
+    """
+
+    board: Board
+    state: bytearray
+    clues: list[int]
+
+    def __init__(self, board: Board):
+        self.board = board
+        self.cell_edges = rows(board.cell_edges)
+        self.edge_cells = rows(board.edge_cells)
+        self.cell_junctions = rows(board.cell_junctions)
+        self.edge_junctions = rows(board.edge_junctions)
+        self.junction_edges = rows(board.junction_edges)
+        self.clues = list(board.constraints)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything that has been deduced."""
+        self.state = bytearray([UNKNOWN]) * self.board.num_edges
+        self.cell_on = [0] * self.board.num_cells
+        self.cell_unknown = [len(edges) for edges in self.cell_edges]
+        self.junction_on = [0] * self.board.num_junctions
+        self.junction_unknown = [len(edges) for edges in self.junction_edges]
+        self.queue: deque[tuple[int, int]] = deque()
+        self.queued = [
+            bytearray(self.board.num_cells),
+            bytearray(self.board.num_junctions),
+        ]
+        self.rules = {
+            rule: {"edges": 0, "cells": 0}
+            for rule in (
+                "cell",
+                "junction",
+                "corner",
+                "adjacent",
+                "loop",
+                "colour",
+                "probe",
+                "search",
+            )
+        }
+        self.trail: list[int] = []
+        self.parent = list(range(self.board.num_junctions))
+        self.component_size = [1] * self.board.num_junctions
+        self.component_edges = [0] * self.board.num_junctions
+        self.joins: list[tuple[int, int]] = []
+        self.num_on = 0
+        self.outside = self.board.num_cells
+        self.colour_parent = list(range(self.board.num_cells + 1))
+        self.colour_parity = [0] * (self.board.num_cells + 1)
+        self.colour_size = [1] * (self.board.num_cells + 1)
+        self.colourings: list[tuple[int, int]] = []
+        self.nodes = 0
+        self.solutions: list[bytes] = []
+        self.probing = False
+        self.deadline: float | None = None
+
+    def restart(self) -> None:
+        """Undo every set edge through the trail, which is much cheaper than
+        :meth:`reset` when only part of the board was deduced."""
+        self.undo(0)
+
+    def set_clue(self, c: int, clue: int | None) -> None:
+        """Change the clue of a cell without touching the board.
+
+        The cell and its junctions are queued, so a :meth:`propagate` builds
+        on what has already been deduced. That is only sound when the clue
+        gets stricter, e.g. when a missing clue is filled in; after a clue is
+        removed, :meth:`restart` to forget what was deduced from it.
+        """
+        self.clues[c] = -1 if clue is None else clue
+        self.push(CELL, c)
+        for j in self.cell_junctions[c]:
+            self.push(JUNCTION, j)
+
+    def count_solutions(
+        self,
+        limit: int = 2,
+        node_limit: int | None = None,
+        time_limit: float | None = None,
+    ) -> int | None:
+        """Count the solutions of the current clues, up to ``limit``.
+
+        :return: the number of solutions found, or None when the search ran
+            out of its budget before it knew
+        """
+        self.restart()
+        result = self.search(limit, node_limit, time_limit)
+        if result.status == "budget":
+            return None
+        return result.solutions
+
+    # Setting edges
+
+    def set_edge(self, edge: int, value: int, rule: str) -> None:
+        current = self.state[edge]
+        if current == value:
+            return
+        if current != UNKNOWN:
+            raise Contradiction(f"Edge {edge} is both on and off")
+
+        self.state[edge] = value
+        self.trail.append(edge)
+        stats = self.rules[rule]
+        stats["edges"] += 1
+        on = value == ON
+        for c in self.edge_cells[edge]:
+            self.cell_unknown[c] -= 1
+            if on:
+                self.cell_on[c] += 1
+            if self.cell_unknown[c] == 0:
+                stats["cells"] += 1
+            self.push(CELL, c)
+        for j in self.edge_junctions[edge]:
+            self.junction_unknown[j] -= 1
+            if on:
+                self.junction_on[j] += 1
+            self.push(JUNCTION, j)
+
+        # Record both joins before raising, so that undo stays in step
+        closed = self.join(edge) if on else False
+        if not self.colour(edge, on):
+            raise Contradiction(f"Edge {edge} breaks the inside and outside")
+        if closed:
+            loop = self.find(self.edge_junctions[edge][0])
+            if self.component_edges[loop] != self.num_on:
+                raise Contradiction(f"Edge {edge} closes a loop too early")
+            self.set_unknown(range(len(self.state)), OFF, "loop")
+
+    def set_unknown(self, edges, value: int, rule: str) -> None:
+        for e in edges:
+            if self.state[e] == UNKNOWN:
+                self.set_edge(e, value, rule)
+
+    def push(self, kind: int, ident: int) -> None:
+        queued = self.queued[kind]
+        if not queued[ident]:
+            queued[ident] = 1
+            self.queue.append((kind, ident))
+
+    # Undoing
+
+    def undo(self, mark: int) -> None:
+        """Unset every edge that was set after the trail had length ``mark``."""
+        trail = self.trail
+        while len(trail) > mark:
+            edge = trail.pop()
+            on = self.state[edge] == ON
+            self.state[edge] = UNKNOWN
+            for c in self.edge_cells[edge]:
+                self.cell_unknown[c] += 1
+                if on:
+                    self.cell_on[c] -= 1
+            for j in self.edge_junctions[edge]:
+                self.junction_unknown[j] += 1
+                if on:
+                    self.junction_on[j] -= 1
+            if on:
+                self.unjoin()
+            self.uncolour()
+        self.clear_queue()
+
+    def clear_queue(self) -> None:
+        for kind, ident in self.queue:
+            self.queued[kind][ident] = 0
+        self.queue.clear()
+
+    # Loop connectivity
+
+    def find(self, j: int) -> int:
+        parent = self.parent
+        while parent[j] != j:
+            j = parent[j]
+        return j
+
+    def join(self, edge: int) -> bool:
+        """Join the junctions of an ON edge.
+
+        :return: whether the edge closes a loop, which then has to hold
+            every ON edge
+        """
+        first, second = (self.find(j) for j in self.edge_junctions[edge])
+        self.num_on += 1
+        if first == second:
+            self.component_edges[first] += 1
+            self.joins.append((first, -1))
+            return True
+
+        if self.component_size[first] < self.component_size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.component_size[first] += self.component_size[second]
+        self.component_edges[first] += self.component_edges[second] + 1
+        self.joins.append((first, second))
+        return False
+
+    def unjoin(self) -> None:
+        first, second = self.joins.pop()
+        self.num_on -= 1
+        if second < 0:
+            self.component_edges[first] -= 1
+            return
+        self.parent[second] = second
+        self.component_size[first] -= self.component_size[second]
+        self.component_edges[first] -= self.component_edges[second] + 1
+
+    # Inside and outside
+
+    def find_colour(self, c: int) -> tuple[int, int]:
+        """The root of a cell's colour class and whether the cell is on the
+        other side of the loop than the root."""
+        parent, parity = self.colour_parent, self.colour_parity
+        side = 0
+        while parent[c] != c:
+            side ^= parity[c]
+            c = parent[c]
+        return c, side
+
+    def other_side(self, edge: int, c: int) -> int:
+        """The cell across an edge, or the outside of the board."""
+        for other in self.edge_cells[edge]:
+            if other != c:
+                return other
+        return self.outside
+
+    def colour(self, edge: int, on: bool) -> bool:
+        """Join the cells on both sides of an edge, on opposite sides of the
+        loop when it is ON and on the same side when it is OFF.
+
+        :return: False when the cells are already known to be the other way
+        """
+        cells = self.edge_cells[edge]
+        first, first_side = self.find_colour(cells[0])
+        second, second_side = self.find_colour(self.other_side(edge, cells[0]))
+        side = first_side ^ second_side ^ on
+        if first == second:
+            self.colourings.append((first, -1))
+            return side == 0
+
+        if self.colour_size[first] < self.colour_size[second]:
+            first, second = second, first
+        self.colour_parent[second] = first
+        self.colour_parity[second] = side
+        self.colour_size[first] += self.colour_size[second]
+        self.colourings.append((first, second))
+        return True
+
+    def uncolour(self) -> None:
+        first, second = self.colourings.pop()
+        if second < 0:
+            return
+        self.colour_parent[second] = second
+        self.colour_parity[second] = 0
+        self.colour_size[first] -= self.colour_size[second]
+
+    # Rules
+
+    def check_cell(self, c: int) -> None:
+        if self.cell_unknown[c]:
+            self.check_colour(c)
+        clue = self.clues[c]
+        if clue < 0:
+            return
+        on, unknown = self.cell_on[c], self.cell_unknown[c]
+        if on > clue or on + unknown < clue:
+            raise Contradiction(f"Cell {c} can not have {clue} edges")
+        if unknown == 0:
+            return
+        if on == clue:
+            self.set_unknown(self.cell_edges[c], OFF, "cell")
+        elif on + unknown == clue:
+            self.set_unknown(self.cell_edges[c], ON, "cell")
+
+    def check_colour(self, c: int) -> None:
+        """An open edge between two cells whose sides of the loop are already
+        known is ON when they differ and OFF when they are the same."""
+        root, side = self.find_colour(c)
+        for e in self.cell_edges[c]:
+            if self.state[e] != UNKNOWN:
+                continue
+            other, other_side = self.find_colour(self.other_side(e, c))
+            if other == root:
+                self.set_edge(e, ON if side != other_side else OFF, "colour")
+
+    def check_junction(self, j: int) -> None:
+        on, unknown = self.junction_on[j], self.junction_unknown[j]
+        if on > 2 or (on == 1 and unknown == 0):
+            raise Contradiction(f"Junction {j} has {on} edges")
+        if unknown == 0:
+            return
+        edges = self.junction_edges[j]
+        if on == 2:
+            self.set_unknown(edges, OFF, "junction")
+        elif unknown == 1:
+            self.set_unknown(edges, ON if on == 1 else OFF, "junction")
+        elif on == 0 and unknown == 2:
+            self.check_corner(edges)
+        elif on == 1:
+            self.check_loop(j, edges)
+
+    def check_loop(self, j: int, edges) -> None:
+        """An open edge from the end of a path back onto the same path
+        would close a loop, which is only allowed when it holds every ON edge.
+        """
+        root = self.find(j)
+        if self.component_edges[root] == self.num_on:
+            return
+        for e in edges:
+            if self.state[e] != UNKNOWN:
+                continue
+            for k in self.edge_junctions[e]:
+                if k != j and self.find(k) == root:
+                    self.set_edge(e, OFF, "loop")
+
+    def check_corner(self, edges) -> None:
+        """A junction whose only open edges are two sides of the same cell.
+
+        A loop through the junction takes both sides or neither, so a cell
+        with clue 1 can take neither, and a cell that needs all but one of
+        its sides has to take both.
+        """
+        first, second = [e for e in edges if self.state[e] == UNKNOWN]
+        for c in self.edge_cells[first]:
+            if c not in self.edge_cells[second]:
+                continue
+            clue = self.clues[c]
+            if clue == 1:
+                self.set_unknown((first, second), OFF, "corner")
+            elif clue == len(self.cell_edges[c]) - 1:
+                self.set_unknown((first, second), ON, "corner")
+
+    def apply_adjacent(self) -> None:
+        """Two neighbouring cells that both need all but one of their sides.
+
+        The sides of both cells away from the shared edge are on, and the
+        edges leaving the ends of the shared edge are off, otherwise one of
+        the cells can not reach its clue.
+
+        The shared edge itself is left alone on purpose. It is on in every
+        solution but one: the loop around just the two cells, which leaves
+        it off, and which counting solutions has to find as well.
+        """
+        for shared, cells in enumerate(self.edge_cells):
+            if len(cells) != 2:
+                continue
+            c1, c2 = cells
+            sides = len(self.cell_edges[c1])
+            if sides != len(self.cell_edges[c2]):
+                continue
+            if self.clues[c1] != sides - 1 or self.clues[c2] != sides - 1:
+                continue
+
+            ends = set()
+            for j in self.edge_junctions[shared]:
+                ends.update(self.junction_edges[j])
+            both = set(self.cell_edges[c1]) | set(self.cell_edges[c2])
+            self.set_unknown([e for e in both if e not in ends], ON, "adjacent")
+            self.set_unknown([e for e in ends if e not in both], OFF, "adjacent")
+
+    # Solving
+
+    def propagate(self) -> None:
+        """Apply the rules until nothing changes or a contradiction is found."""
+        queue = self.queue
+        while queue:
+            kind, ident = queue.popleft()
+            self.queued[kind][ident] = 0
+            if kind == CELL:
+                self.check_cell(ident)
+            else:
+                self.check_junction(ident)
+
+    def solve(self) -> SolveResult:
+        start = time.perf_counter()
+        try:
+            self.apply_adjacent()
+            for c in range(self.board.num_cells):
+                self.push(CELL, c)
+            for j in range(self.board.num_junctions):
+                self.push(JUNCTION, j)
+            self.propagate()
+        except Contradiction:
+            status = "contradiction"
+        else:
+            status = self.status()
+        return SolveResult(status, time.perf_counter() - start, self.rules)
+
+    def search(
+        self,
+        limit: int = 1,
+        node_limit: int | None = None,
+        time_limit: float | None = None,
+        probe: bool = True,
+    ) -> SolveResult:
+        """Propagate, then search depth first for up to ``limit`` solutions.
+
+        Guesses are undone through the trail. Every guess counts as a node,
+        and the search gives up with status "budget" once it has used
+        ``node_limit`` nodes or ``time_limit`` seconds. The solutions found
+        are kept in ``solutions`` and the state is left at the last of them.
+
+        :param limit: stop after this many solutions, e.g. 2 to check uniqueness
+        :param node_limit: the most guesses to make
+        :param time_limit: the most seconds to search
+        :param probe: whether to :meth:`probe` after every guess, which costs
+            more per node but usually needs far fewer nodes
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.solutions = []
+        self.probing = probe
+        self.deadline = None if time_limit is None else start + time_limit
+        ok = self.solve().status != "contradiction" and self.try_probe()
+        stack: list[tuple[int, int, int, bool]] = []
+        status = "contradiction"
+
+        while True:
+            if (node_limit is not None and self.nodes >= node_limit) or (
+                time_limit is not None and time.perf_counter() - start >= time_limit
+            ):
+                status = "budget"
+                break
+
+            if ok:
+                edge = self.pick_edge()
+                if edge is None:
+                    # Every edge OFF is decided too, but it is no loop
+                    if self.num_on == 0:
+                        ok = False
+                        continue
+                    self.solutions.append(bytes(self.state))
+                    if len(self.solutions) >= limit:
+                        break
+                    ok = False
+                    continue
+                stack.append((edge, len(self.trail), ON, False))
+                ok = self.branch(edge, ON)
+                continue
+
+            if not stack:
+                break
+            edge, mark, value, second = stack.pop()
+            self.undo(mark)
+            if second:
+                continue
+            value = OFF if value == ON else ON
+            stack.append((edge, mark, value, True))
+            ok = self.branch(edge, value)
+
+        if status != "budget" and self.solutions:
+            status = "solved"
+        self.deadline = None
+        return SolveResult(
+            status,
+            time.perf_counter() - start,
+            self.rules,
+            self.nodes,
+            len(self.solutions),
+        )
+
+    def branch(self, edge: int, value: int) -> bool:
+        self.nodes += 1
+        try:
+            self.set_edge(edge, value, "search")
+            self.propagate()
+        except Contradiction:
+            self.clear_queue()
+            return False
+        return self.try_probe()
+
+    def try_probe(self) -> bool:
+        if not self.probing:
+            return True
+        try:
+            self.probe()
+        except Contradiction:
+            self.clear_queue()
+            return False
+        return True
+
+    def probe(self, edges: Sequence[int] | None = None) -> None:
+        """Try both values of every unknown edge and keep the one that is left
+        when the other leads to a contradiction, until nothing changes.
+
+        The trials are undone through the trail and are not counted in the
+        rule statistics. Probing stops early once the search deadline passes.
+
+        :param edges: only try these edges, all of them when left out
+        """
+        rules = self.rules
+        trial = {rule: {"edges": 0, "cells": 0} for rule in rules}
+        state = self.state
+        if edges is None:
+            edges = range(len(state))
+        changed = True
+        while changed:
+            changed = False
+            for edge in edges:
+                if state[edge] != UNKNOWN:
+                    continue
+                if self.deadline is not None and time.perf_counter() > self.deadline:
+                    return
+                mark = len(self.trail)
+                for value in (ON, OFF):
+                    self.rules = trial
+                    try:
+                        self.set_edge(edge, value, "search")
+                        self.propagate()
+                        failed = False
+                    except Contradiction:
+                        failed = True
+                    finally:
+                        self.undo(mark)
+                        self.rules = rules
+                    if failed:
+                        self.set_edge(edge, OFF if value == ON else ON, "probe")
+                        self.propagate()
+                        changed = True
+                        break
+
+    def pick_edge(self) -> int | None:
+        """The most constrained unknown edge.
+
+        An edge leaving the end of a path comes first, since one of the open
+        edges there has to be ON, then an edge of the cell with the fewest
+        unknown edges left, then any unknown edge.
+        """
+        state = self.state
+        best, best_unknown = None, None
+        for j, on in enumerate(self.junction_on):
+            if on == 1:
+                unknown = self.junction_unknown[j]
+                if unknown and (best_unknown is None or unknown < best_unknown):
+                    best, best_unknown = j, unknown
+                    if unknown == 2:
+                        break
+        if best is not None:
+            for e in self.junction_edges[best]:
+                if state[e] == UNKNOWN:
+                    return e
+
+        best, best_unknown = None, None
+        for c, clue in enumerate(self.clues):
+            unknown = self.cell_unknown[c]
+            if (
+                clue >= 0
+                and unknown
+                and (best_unknown is None or unknown < best_unknown)
+            ):
+                best, best_unknown = c, unknown
+        if best is not None:
+            for e in self.cell_edges[best]:
+                if state[e] == UNKNOWN:
+                    return e
+
+        edge = state.find(UNKNOWN)
+        return None if edge < 0 else edge
+
+    def status(self) -> str:
+        if UNKNOWN in self.state:
+            return "stalled"
+        return "solved" if self.is_single_loop() else "contradiction"
+
+    def is_single_loop(self) -> bool:
+        """Whether the ON edges form exactly one closed loop."""
+        selected = [e for e, s in enumerate(self.state) if s == ON]
+        if not selected:
+            return False
+        seen = {selected[0]}
+        stack = [selected[0]]
+        while stack:
+            edge = stack.pop()
+            for j in self.edge_junctions[edge]:
+                for e in self.junction_edges[j]:
+                    if e not in seen and self.state[e] == ON:
+                        seen.add(e)
+                        stack.append(e)
+        return len(seen) == len(selected)
+
+    def apply(self) -> None:
+        """Write the deduced edges onto the board, crossing out OFF edges."""
+        self.board.edge_status[:] = self.state
+
+
+def rows(incidence) -> list[tuple[int, ...]]:
+    return [tuple(incidence.row(i)) for i in range(len(incidence))]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse.csgraph import connected_components  # type: ignore
+
+from shared.board import Board
+from shared.enums import EdgeStatus
+
+
+@dataclass
+class Validation:
+    """The outcome of validating a batch of submissions, one entry each.
+
+    ``clues`` is whether every numbered cell has as many selected edges as
+    its number, ``junctions`` whether every junction has zero or two, and
+    ``single_loop`` whether the selected edges are one connected, non-empty
+    group. With all three, the selection is exactly one closed loop.
+    """
+
+    clues: np.ndarray
+    junctions: np.ndarray
+    single_loop: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.clues & self.junctions & self.single_loop
+
+
+class Validator:
+    """Checks submitted solutions of one puzzle in bulk, without a Game.
+
+    The incidence of the board is turned into sparse matrices once, so a
+    whole batch of selections, one row of edges each, is counted around
+    every cell and junction with two sparse products. Connectivity is
+    checked by joining all the selections of a batch into one graph, with
+    a separate copy of the junctions for every submission, and finding its
+    connected components in a single call.
+    """
+
+    num_edges: int
+    num_junctions: int
+
+    def __init__(self, board: Board, clues: np.ndarray | None = None):
+        """
+        :param board: the topology of the puzzle, its state is not read
+        :param clues: the number of every cell, -1 for none, the numbers of
+            the board when left out
+        """
+        self.num_edges = board.num_edges
+        self.num_junctions = board.num_junctions
+        if clues is None:
+            clues = np.frombuffer(board.constraints, dtype=np.int8)
+        clues = np.asarray(clues)
+        self.numbered = np.flatnonzero(clues >= 0)
+        self.clues = clues[self.numbered].astype(np.int32)
+        self.cell_edges = incidence_matrix(board.cell_edges, board.num_edges)
+        self.cell_edges = self.cell_edges[self.numbered]
+        self.junction_edges = incidence_matrix(board.junction_edges, board.num_edges)
+        _, ends = board.edge_junctions.numpy()
+        self.ends = ends.reshape(-1, 2)
+
+    def validate(self, selections: np.ndarray) -> Validation:
+        """Validate a batch of selections.
+
+        :param selections: whether every edge is selected, as an array of
+            shape (submissions, edges), or (edges,) for a single submission
+        """
+        selected = np.atleast_2d(np.asarray(selections, dtype=bool))
+        if selected.shape[1] != self.num_edges:
+            raise ValueError(
+                f"Expected {self.num_edges} edges, got {selected.shape[1]}"
+            )
+        count = len(selected)
+        matrix = sparse.csr_matrix(selected, dtype=np.int32)
+
+        around_cells = (matrix @ self.cell_edges.T).toarray()
+        clues = (around_cells == self.clues).all(axis=1)
+
+        degrees = (matrix @ self.junction_edges.T).toarray()
+        junctions = ((degrees == 0) | (degrees == 2)).all(axis=1)
+
+        # One graph over a copy of the junctions for every submission
+        submission, edge = matrix.nonzero()
+        offset = submission * self.num_junctions
+        nodes = count * self.num_junctions
+        graph = sparse.coo_matrix(
+            (
+                np.ones(len(edge), dtype=np.int8),
+                (offset + self.ends[edge, 0], offset + self.ends[edge, 1]),
+            ),
+            shape=(nodes, nodes),
+        )
+        _, labels = connected_components(graph, directed=False)
+        active = np.flatnonzero(degrees.ravel())
+        groups = np.unique(labels[active], return_index=True)[1]
+        components = np.bincount(active[groups] // self.num_junctions, minlength=count)
+
+        return Validation(clues, junctions, components == 1)
+
+    def validate_packed(self, bits: np.ndarray) -> Validation:
+        """Validate a batch of selections packed with ``np.packbits``, in
+        little bit order, so that a submission only takes a bit per edge.
+
+        :param bits: an array of shape (submissions, ceil(edges / 8))
+        """
+        bits = np.atleast_2d(np.asarray(bits, dtype=np.uint8))
+        selected = np.unpackbits(bits, axis=1, count=self.num_edges, bitorder="little")
+        return self.validate(selected)
+
+
+def incidence_matrix(incidence, num_cols: int) -> sparse.csr_matrix:
+    """An :class:`Incidence` as a sparse 0/1 matrix of shape (rows, cols)."""
+    offsets, indices = incidence.numpy()
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, offsets), shape=(len(incidence), num_cols))
+
+
+def pack(selections: np.ndarray) -> np.ndarray:
+    """Pack selections for :meth:`Validator.validate_packed`."""
+    selected = np.atleast_2d(np.asarray(selections, dtype=bool))
+    return np.packbits(selected, axis=1, bitorder="little")
+
+
+def selection(board: Board) -> np.ndarray:
+    """The edges a player has selected on a board, for :meth:`Validator.validate`."""
+    status = np.frombuffer(board.edge_status, dtype=np.uint8)
+    return status == EdgeStatus.SELECTED.value
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from generator.puzzle_file import PuzzleReader, PuzzleRecord, PuzzleWriter
+
+
+def record(size=(3, 2), seed=7) -> PuzzleRecord:
+    clues = np.array([0, 3, -1, 2, -1, 1], dtype=np.int8)
+    solution = np.array([True, False, True] * 5 + [False, True], dtype=bool)
+    shape = "square" if isinstance(size, tuple) else "hexagon"
+    return PuzzleRecord(shape, size, seed, clues, solution)
+
+
+def test_round_trip(tmp_path):
+    records = [record(), record(5, 2**64 - 1), record((0xFFFF, 0))]
+    with PuzzleWriter(str(tmp_path / "pack.slk")) as writer:
+        for r in records:
+            writer.write(r)
+    with PuzzleReader(str(tmp_path / "pack.slk")) as reader:
+        for r, read in zip(records, reader):
+            assert (read.shape, read.size, read.seed) == (r.shape, r.size, r.seed)
+            assert (read.clues == r.clues).all()
+            assert (read.solution == r.solution).all()
+            assert read.puzzle_id == r.puzzle_id
+
+
+@pytest.mark.parametrize(
+    "size, seed",
+    [
+        ((0x10000, 1), 0),
+        ((1, 0x10000), 0),
+        ((-1, 1), 0),
+        (-1, 0),
+        (5, 1 << 64),
+        (5, -1),
+    ],
+)
+def test_encode_rejects_what_does_not_fit(size, seed):
+    with pytest.raises(ValueError):
+        record(size, seed).encode()
+
+
+def test_encode_rejects_large_clues():
+    r = record()
+    r.clues[0] = 15
+    with pytest.raises(ValueError):
+        r.encode()
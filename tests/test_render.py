@@ -0,0 +1,61 @@
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from app.app import BACKGROUND  # noqa: E402
+from app.shapes import HexagonApp, RectangleApp  # noqa: E402
+from game import Game  # noqa: E402
+
+BOARDS = [("hexagon", 8, HexagonApp), ("hexagon", 15, HexagonApp)]
+BOARDS += [("square", (8, 8), RectangleApp)]
+
+
+def make_app(shape, size, app_type, zoom):
+    if shape == "square":
+        game = Game.generate_random_shape(shape, size2=size, seed=2)
+    else:
+        game = Game.generate_random_shape(shape, size1=size, seed=2)
+    game.populate_numbers()
+    app = app_type(game, (600, 600))
+    app.start()
+    app.ratio = 1
+    app.draw()
+    while app.zoom_level < zoom:
+        app.zoom(4, app.screen.get_rect().center)
+        app.ratio = app.rect.height // app.og_window_size[1]
+    app.draw()
+    return app
+
+
+def full_frame(app) -> pygame.Surface:
+    """The screen as drawing every item of the board at once leaves it."""
+    frame = app.screen.copy()
+    frame.fill(BACKGROUND)
+    if app.layer is not None:
+        frame.blit(app.layer, app.rect.topleft)
+    else:
+        board = pygame.Rect((0, 0), app.rect.size)
+        app.paint(frame, board, app.rect.topleft)
+    return frame
+
+
+@pytest.mark.parametrize("zoom", [1, 2, 4])
+@pytest.mark.parametrize("shape, size, app_type", BOARDS)
+def test_partial_redraws_match_a_full_frame(shape, size, app_type, zoom):
+    app = make_app(shape, size, app_type, zoom)
+    rng = random.Random(zoom)
+    width, height = app.screen.get_size()
+    for step in range(200):
+        if step % 3 == 0:
+            app.rect.move_ip(rng.randint(-40, 40), rng.randint(-40, 40))
+            app.draw()
+        app.handle_collision((rng.randrange(width), rng.randrange(height)))
+        app.draw()
+        if step % 20 == 19:
+            screen = pygame.image.tobytes(app.screen, "RGB")
+            assert screen == pygame.image.tobytes(full_frame(app), "RGB"), step
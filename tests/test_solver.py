@@ -0,0 +1,11 @@
+from generator.shapes import Rectangle
+from solver import Solver
+
+
+def test_adjacent_threes_around_just_the_two_cells():
+    # The only loop is the one around both cells, which leaves the edge
+    # between them off, so the adjacent rule must not set it on
+    solver = Solver(Rectangle.generate((2, 1), 1).board)
+    solver.set_clue(0, 3)
+    solver.set_clue(1, 3)
+    assert solver.count_solutions(limit=3) == 1